@@ -0,0 +1,96 @@
+# Benchmark: FieldExtractor (ein Durchlauf über die Ziel-Tags) gegen die frühere get_text-Kette
+#
+#   python benchmarks/bench_extraction.py [XML-Verzeichnis] [--records N] [--padding N]
+#
+# Ohne Verzeichnis werden synthetische ISO-19139-Datensätze erzeugt.
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metat
+from synthetic import generate_records
+
+# Die Abfragen der bisherigen extract_metadata-Implementierung, einzeln per root.find
+LEGACY_GEO_XPATHS = metat.FIELD_PLAN['geo_raw']
+LEGACY_XPATHS = [
+    './/gmd:metadataStandardName/gco:CharacterString',
+    './/gmd:fileIdentifier/gco:CharacterString',
+    './/srv:identifier/gco:CharacterString',
+    './/gmd:title/gco:CharacterString',
+    './/gmd:abstract/gco:CharacterString',
+    './/gmd:pointOfContact//gmd:organisationName/gco:CharacterString',
+    './/gmd:electronicMailAddress/gco:CharacterString',
+    './/gmd:metadataStandardName/gco:CharacterString',
+    './/gmd:metadataStandardVersion/gco:CharacterString',
+    './/gmd:date//gco:DateTime',
+    './/gmd:dateStamp/gco:Date',
+    './/gmd:dateStamp/gco:Date',
+    './/gmd:distributionFormat//gmd:name/gco:CharacterString'
+]
+
+def legacy_extract(record):
+    fields = {}
+    geo_raw = None
+    for xpath in LEGACY_GEO_XPATHS:
+        geo_raw = metat.get_text(record, xpath)
+        if geo_raw:
+            break
+    fields['geo_raw'] = geo_raw
+    for xpath in LEGACY_XPATHS:
+        fields[xpath] = metat.get_text(record, xpath)
+    fields['license_texts'] = [
+        lt.text.strip() for lt in record.findall('.//gmd:resourceConstraints//gmd:otherConstraints/gco:CharacterString', metat.namespaces)
+        if lt.text
+    ]
+    urls = []
+    for res in record.findall('.//gmd:transferOptions//gmd:onLine//gmd:CI_OnlineResource', metat.namespaces):
+        url_el = res.find('.//gmd:URL', metat.namespaces)
+        if url_el is not None and url_el.text:
+            urls.append(url_el.text.strip())
+    fields['online_urls'] = urls
+    return fields
+
+def planned_extract(record):
+    record.fields = None
+    return metat.FIELD_EXTRACTOR.extract(record)
+
+def load_records(xml_dir, count, padding):
+    if xml_dir:
+        files = sorted(os.path.join(xml_dir, f) for f in os.listdir(xml_dir) if f.endswith('.xml'))
+        return [metat.parse_record(f) for f in files[:count]]
+    return [metat.parse_record(io.BytesIO(xml.encode('utf-8'))) for xml in generate_records(count, keywords=padding)]
+
+def timed(fn, records, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            fn(record)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="FieldExtractor gegen get_text-Kette")
+    parser.add_argument('xml_dir', nargs='?')
+    parser.add_argument('--records', type=int, default=500)
+    parser.add_argument('--padding', type=int, default=200, help='Anzahl zusätzlicher Schlagwort-Elemente je Datensatz')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_records(args.xml_dir, args.records, args.padding)
+    if not records:
+        print("Keine Datensätze gefunden.")
+        return
+    legacy = timed(legacy_extract, records, args.repeat)
+    planned = timed(planned_extract, records, args.repeat)
+    print(f"{len(records)} Datensätze")
+    print(f"get_text-Kette:  {legacy * 1e6:9.1f} µs/Datensatz")
+    print(f"FieldExtractor:  {planned * 1e6:9.1f} µs/Datensatz  (Faktor {legacy / planned:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Benchmark: Startzeit von Worker-Prozessen und kurzen CLI-Aufrufen
+#
+#   python benchmarks/bench_import.py [--repeat N] [--baseline ALTE_METAT.PY]
+#
+# Jeder Fall läuft in einem frischen Interpreter. Gemessen wird die Zeit bis zum Ende des
+# Aufrufs, dazu welche schweren Abhängigkeiten dabei geladen wurden.
+# --baseline misst zum Vergleich eine ältere, ungeteilte metat.py (z. B. aus git show).
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ['pandas', 'numpy', 'requests', 'tkinter', 'openpyxl', 'bs4', 'uri_template', 'lxml.etree']
+
+CASES = {
+    'python (leer)': 'pass',
+    'Worker (metat_core)': 'import metat_core',
+    'import metat': 'import metat',
+    'metat --help': 'import sys, metat; sys.argv = ["metat", "--help"]; metat.main()',
+    'Netz-Schicht': 'import metat; metat.ReachabilityChecker'
+}
+
+def run(code, cwd, repeat):
+    # SystemExit von --help abfangen, danach die geladenen schweren Module ausgeben
+    script = (f'try:\n    {code}\nexcept SystemExit:\n    pass\n'
+              f'import sys\nprint("geladen:" + ",".join(m for m in {HEAVY!r} if m in sys.modules))')
+    times, loaded = [], ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', script], cwd=cwd, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode:
+            raise RuntimeError(result.stderr)
+        loaded = result.stdout.rpartition('geladen:')[2].strip()
+    return statistics.median(times), loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit von Worker-Prozessen und CLI-Aufrufen")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', help='ältere metat.py, deren Import zum Vergleich gemessen wird')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy(args.baseline, os.path.join(tmp, 'metat.py'))
+            baseline = run('import metat', tmp, args.repeat)
+
+    empty = None
+    for name, code in CASES.items():
+        seconds, loaded = run(code, ROOT, args.repeat)
+        empty = seconds if empty is None else empty
+        print(f"{name:<22}{seconds * 1000:8.1f} ms  (+{(seconds - empty) * 1000:6.1f} ms)  {loaded or '-'}")
+    if baseline:
+        seconds, loaded = baseline
+        print(f"{'import metat (alt)':<22}{seconds * 1000:8.1f} ms  (+{(seconds - empty) * 1000:6.1f} ms)  {loaded or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Benchmark: analyze_files seriell gegen Prozess-Pool
+#
+#   python benchmarks/bench_parallel.py [XML-Verzeichnis] [--records N] [--workers N] [--chunksize N]
+#
+# Ohne Verzeichnis werden synthetische Datensätze in ein temporäres Verzeichnis geschrieben.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metat
+from synthetic import write_catalog
+
+def run(files, workers, chunksize):
+    start = time.perf_counter()
+    errors = sum(1 for _, _, error in metat.analyze_files(files, workers, chunksize) if error)
+    return time.perf_counter() - start, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="analyze_files seriell gegen Prozess-Pool")
+    parser.add_argument('xml_dir', nargs='?')
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--padding', type=int, default=200, help='Anzahl zusätzlicher Schlagwort-Elemente je Datensatz')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = args.xml_dir
+        if not xml_dir:
+            xml_dir = tmp
+            write_catalog(xml_dir, args.records, keywords=args.padding)
+        files = sorted(os.path.join(xml_dir, f) for f in os.listdir(xml_dir) if f.endswith('.xml'))
+
+        serial, _ = run(files, 1, args.chunksize)
+        parallel, errors = run(files, args.workers, args.chunksize)
+
+    print(f"{len(files)} Dateien, {errors} Fehler")
+    print(f"seriell:            {len(files) / serial:9.1f} Dateien/s")
+    print(f"{args.workers:2d} Prozesse:        {len(files) / parallel:9.1f} Dateien/s  (Faktor {serial / parallel:.2f})")
+
+if __name__ == "__main__":
+    main()
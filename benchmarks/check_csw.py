@@ -0,0 +1,77 @@
+# End-to-End-Prüfung des CSW-Harvestings gegen den lokalen Stub (/csw in stub_server.py)
+#
+#   python benchmarks/check_csw.py [--records N] [--page-cap N] [--page-size N]
+#
+# 1. vollständiger Lauf: alle Datensätze über mehrere Seiten (nextRecord), Cursor danach gelöscht
+# 2. Abbruch mitten im Harvest (503 ab einer Position), Cursor bleibt stehen
+# 3. derselbe Aufruf setzt am Cursor fort; die Ausgabe enthält wieder alle Datensätze
+# Außerdem: die xmlns:dcat-Deklaration der GetRecords-Hülle darf RDA-I1-02M nicht setzen.
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metat
+from stub_server import StubServer
+from synthetic import generate_records
+
+def read_ids(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    return [row['Datensatz_ID'] for row in rows], rows
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FEHLER: {message}")
+    print(f"ok: {message}")
+
+def main():
+    parser = argparse.ArgumentParser(description="CSW-Harvesting gegen den lokalen Stub prüfen")
+    parser.add_argument('--records', type=int, default=47)
+    parser.add_argument('--page-cap', type=int, default=10, help='Obergrenze des Stubs je Seite')
+    parser.add_argument('--page-size', type=int, default=20, help='angefragte maxRecords')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubServer(latency=0.0, failure_rate=0.0, head_rejected_rate=0.0, csw_page_cap=args.page_cap) as server:
+        server.csw_records = list(generate_records(args.records, args.seed, base_url=server.base_url))
+        expected = [f'record-{i:06d}' for i in range(args.records)]
+        options = ['--csw', server.base_url + '/csw', '--csw-page-size', str(args.page_size),
+                   '--headless', '--no-cache', '--workers', '1']
+
+        output = os.path.join(tmp, 'voll.csv')
+        metat.main(options + ['--output', output])
+        ids, rows = read_ids(output)
+        check(sorted(set(ids)) == expected, f"vollständiger Lauf liefert alle {args.records} Datensätze")
+        check(len(server.csw_starts) >= -(-args.records // args.page_cap),
+              f"mehrere Seiten über nextRecord geladen ({len(server.csw_starts)} Anfragen)")
+        check(not os.path.exists(output + '.csw-cursor.json'), "Cursor nach vollständigem Lauf gelöscht")
+        check(all(row['RDA-I1-02M'] == 'nein' for row in rows),
+              "Namespace-Deklarationen der GetRecords-Hülle zählen nicht für RDA-I1-02M")
+
+        output = os.path.join(tmp, 'abbruch.csv')
+        fail_from = args.page_cap * 2 + 1
+        server.csw_fail_from = fail_from
+        try:
+            metat.main(options + ['--output', output, '--csw-parallel', '1'])
+        except Exception as e:
+            print(f"erwarteter Abbruch: {type(e).__name__}")
+        else:
+            check(False, "Lauf bricht bei 503 ab")
+        cursor = metat.CswSource(server.base_url + '/csw', cursor_file=output + '.csw-cursor.json').load_cursor()
+        check(1 < cursor <= fail_from, f"Cursor steht nach dem Abbruch bei {cursor}")
+
+        server.csw_fail_from = None
+        server.csw_starts.clear()
+        metat.main(options + ['--output', output])
+        check(min(server.csw_starts) == cursor, f"Fortsetzung beginnt bei startPosition {cursor}")
+        ids, _ = read_ids(output)
+        check(sorted(set(ids)) == expected, "fortgesetzter Lauf enthält alle Datensätze (Journal + Rest)")
+        check(not os.path.exists(output + '.csw-cursor.json'), "Cursor nach Abschluss gelöscht")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Prüft map_unique (Batch-Normalisierung einer pandas-Spalte) gegen die Funktion je Wert
+#
+#   python benchmarks/check_normalize.py [--records N]
+#
+# Für Lizenz-, Format- und Medientyp-Spalten aus synthetischen Datensätzen, ergänzt um leere und
+# fehlende Werte (None, NaN, pd.NA): gleiches Ergebnis wie fn je Wert, fehlende Werte bleiben
+# fehlend, Index bleibt erhalten und fn läuft nur einmal je unterschiedlichem Wert.
+import argparse
+import io
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metat
+from synthetic import generate_records
+
+MISSING = [None, float('nan'), pd.NA]
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FEHLER: {message}")
+    print(f"ok: {message}")
+
+def same(a, b):
+    return (pd.isna(a) and pd.isna(b)) if pd.isna(a) or pd.isna(b) else a == b
+
+def check_column(name, values, fn):
+    series = pd.Series(values + MISSING + [''] + values[:5], dtype=object)
+    series.index = series.index * 10 + 3  # kein Standardindex, damit ein Verlust auffällt
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return fn(value)
+
+    mapped = metat.map_unique(series, counted)
+    check(list(mapped.index) == list(series.index), f"{name}: Index bleibt erhalten")
+    check(all(pd.isna(mapped[i]) for i in series.index if pd.isna(series[i])), f"{name}: fehlende Werte bleiben fehlend")
+    check(all(same(mapped[i], fn(series[i])) for i in series.index if not pd.isna(series[i])),
+          f"{name}: gleiches Ergebnis wie {fn.__name__} je Wert")
+    check(len(calls) == series.dropna().nunique(), f"{name}: {len(calls)} Aufrufe für {len(series)} Werte")
+
+def main():
+    parser = argparse.ArgumentParser(description="map_unique gegen die Normalisierung je Wert prüfen")
+    parser.add_argument('--records', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    records = [metat.parse_record(io.BytesIO(xml.encode('utf-8'))) for xml in generate_records(args.records, args.seed)]
+    fields = [metat.FIELD_EXTRACTOR.extract(record) for record in records]
+    check_column('Lizenz', [t for f in fields for t in f['license_texts']], metat.map_license_url)
+    check_column('Format', [f['format_raw'] for f in fields], metat.recommended_dcat_entry)
+    check_column('Medientyp', ['application/zip; charset=binary', 'Text/CSV', 'application/json', ' image/png '] * 3,
+                 metat.media_type)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Benchmark-Suite: misst jede Pipeline-Stufe einzeln auf synthetischen Datensätzen
+#
+#   python benchmarks/run_benchmarks.py [--records N] [--json ergebnis.json] [--compare alt.json]
+#
+# Stufen: parse, extract, mapping (Lizenz/Format je Wert), mapping_batch (dieselben Werte als Spalten
+# über map_unique), rows (Zeilenaufbau), fair (Indikatoren als Block),
+# output_* (je Ausgabeformat) und end_to_end (main() gegen einen lokalen HTTP-Stub mit
+# simulierter Latenz und Ausfällen, Dialog durch Voreinstellungen ersetzt).
+# Das Ergebnis ist JSON, damit Läufe verglichen werden können.
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metat
+from stub_server import StubServer
+from synthetic import write_catalog
+
+def timed(fn, repeat):
+    # bestes Ergebnis aus repeat Durchläufen
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def result(records, seconds):
+    return {
+        'records': records,
+        'seconds': round(seconds, 6),
+        'per_record_us': round(seconds / max(records, 1) * 1e6, 3),
+        'records_per_s': round(records / max(seconds, 1e-12), 1)
+    }
+
+def stubbed_popup(title, geo_desc):
+    return dict(metat.MANUAL_DEFAULTS, Bundesland=geo_desc or '')
+
+def bench_stages(paths, repeat):
+    stages = {}
+    n = len(paths)
+
+    stages['parse'] = result(n, timed(lambda: [metat.parse_record(p) for p in paths], repeat))
+
+    records = [metat.parse_record(p) for p in paths]
+
+    def extract():
+        for record in records:
+            record.fields = None
+            metat.FIELD_EXTRACTOR.extract(record)
+    stages['extract'] = result(n, timed(extract, repeat))
+
+    licenses = [t for r in records for t in r.fields['license_texts']]
+    formats = [r.fields['format_raw'] for r in records]
+
+    def mapping():
+        for text in licenses:
+            metat.map_license_url(text)
+        for text in formats:
+            metat.recommended_dcat_entry(text)
+    stages['mapping'] = result(n, timed(mapping, repeat))
+
+    license_column, format_column = pd.Series(licenses, dtype=object), pd.Series(formats, dtype=object)
+
+    def mapping_batch():
+        metat.map_unique(license_column, metat.map_license_url)
+        metat.map_unique(format_column, metat.recommended_dcat_entry)
+    stages['mapping_batch'] = result(n, timed(mapping_batch, repeat))
+
+    summaries = [s for s in (metat.analyze_record(r) for r in records) if s]
+    resolved = [
+        {'download_url': s['download_url'] or '', 'download_files': [], 'download_urls': [], 'content_type': None}
+        for s in summaries
+    ]
+    manual = [stubbed_popup(None, s['geo_desc']) for s in summaries]
+
+    def rows():
+        for s, r, m in zip(summaries, resolved, manual):
+            metat.make_entries(s, r, m)
+    stages['rows'] = result(len(summaries), timed(rows, repeat))
+
+    frame = pd.DataFrame([row for s, r, m in zip(summaries, resolved, manual) for row in metat.make_entries(s, r, m)])
+    stages['fair'] = result(len(frame), timed(lambda: metat.evaluate_fair(frame), repeat))
+
+    scored = metat.evaluate_fair(frame)
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in metat.SINKS:
+            def write(ext=ext):
+                with metat.open_sink(os.path.join(tmp, 'out' + ext)) as sink:
+                    sink.write_frame(scored)
+            stages['output_' + ext.lstrip('.')] = result(len(scored), timed(write, repeat))
+    return stages
+
+def bench_end_to_end(args):
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubServer(args.latency, args.failure_rate) as server:
+        xml_dir = os.path.join(tmp, 'xml')
+        write_catalog(xml_dir, args.e2e_records, args.seed, keywords=args.keywords, base_url=server.base_url)
+        # --headless ohne --answers liefert dieselben Voreinstellungen wie stubbed_popup
+        start = time.perf_counter()
+        metat.main(['--input', xml_dir, '--output', os.path.join(tmp, 'out.csv'), '--no-cache', '--headless',
+                    '--workers', str(args.workers)])
+        elapsed = time.perf_counter() - start
+        stage = result(args.e2e_records, elapsed)
+        stage['http_requests'] = server.requests
+        return stage
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['stages']
+    print(f"\n{'Stufe':<16}{'alt µs':>12}{'neu µs':>12}{'Faktor':>9}")
+    for name, stage in current.items():
+        if name in baseline:
+            old, new = baseline[name]['per_record_us'], stage['per_record_us']
+            print(f"{name:<16}{old:>12.1f}{new:>12.1f}{old / max(new, 1e-12):>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-Suite für die Metadaten-Pipeline")
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--keywords', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--e2e-records', type=int, default=200, help='0 = End-to-End-Lauf überspringen')
+    parser.add_argument('--latency', type=float, default=0.02, help='simulierte Antwortzeit des Stubs in Sekunden')
+    parser.add_argument('--failure-rate', type=float, default=0.1)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--json', help='Ergebnisse als JSON hierhin schreiben')
+    parser.add_argument('--compare', help='früheres JSON-Ergebnis zum Vergleich')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_catalog(tmp, args.records, args.seed, keywords=args.keywords)
+        stages = bench_stages(paths, args.repeat)
+    if args.e2e_records:
+        stages['end_to_end'] = bench_end_to_end(args)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'records': args.records,
+            'keywords': args.keywords,
+            'seed': args.seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'stages': stages
+    }
+    for name, stage in stages.items():
+        print(f"{name:<16}{stage['per_record_us']:>12.1f} µs/Datensatz{stage['records_per_s']:>12.1f} /s")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(stages, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Lokaler HTTP-Stub für End-to-End-Läufe: simuliert Latenz, Ausfälle und opengeodata-Indexseiten
+#
+#   /files/...   Download-Ressourcen (HEAD/GET), ein Teil antwortet mit 404/503 oder lehnt HEAD ab
+#   /index/N/    Verzeichnisliste im opengeodata.nrw.de-Format mit einigen Dateien
+#   /csw         CSW 2.0.2 GetRecords über csw_records, höchstens csw_page_cap Datensätze je Seite,
+#                mit nextRecord; ab csw_fail_from antwortet der Dienst mit 503 (Abbruch simulieren)
+import argparse
+import hashlib
+import http.server
+import threading
+import time
+import urllib.parse
+
+INDEX_TEMPLATE = ('<?xml version="1.0" encoding="UTF-8"?>\n<opengeodata><folders/>'
+                  '<files><file name="index.json"/></files>'
+                  '<datasets><dataset name="{name}"><files>{files}</files></dataset></datasets></opengeodata>')
+
+CSW_TEMPLATE = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<csw:GetRecordsResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2" '
+                'xmlns:dcat="http://www.w3.org/ns/dcat#">'  # Hüllen-Deklaration, von keinem Datensatz benutzt
+                '<csw:SearchResults numberOfRecordsMatched="{matched}" numberOfRecordsReturned="{returned}" '
+                'nextRecord="{next}">{records}</csw:SearchResults></csw:GetRecordsResponse>')
+
+def _fraction(path):
+    # deterministisch pro Pfad, damit Wiederholungsläufe vergleichbar bleiben
+    return int(hashlib.md5(path.encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+
+class StubServer:
+    def __init__(self, latency=0.05, failure_rate=0.1, head_rejected_rate=0.1, files_per_index=5, port=0,
+                 csw_records=None, csw_page_cap=10):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.head_rejected_rate = head_rejected_rate
+        self.files_per_index = files_per_index
+        self.csw_records = list(csw_records or [])
+        self.csw_page_cap = csw_page_cap
+        self.csw_fail_from = None
+        self.csw_starts = []  # angefragte startPosition-Werte
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _handler(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, send_body):
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.latency)
+                path = self.path.split('?')[0]
+                content_type = 'application/octet-stream'
+                body = b''
+                if path == '/csw':
+                    status, body = stub._get_records(urllib.parse.urlsplit(self.path).query)
+                    content_type = 'application/xml'
+                elif path.startswith('/index/'):
+                    name = path.strip('/').replace('/', '_')
+                    files = ''.join(f'<file name="{name}_{k}.zip"/>' for k in range(stub.files_per_index))
+                    body = INDEX_TEMPLATE.format(name=name, files=files).encode('utf-8')
+                    content_type = 'application/xml'
+                    status = 200
+                elif _fraction(path) < stub.failure_rate:
+                    status = 503 if _fraction(path + '#') < 0.5 else 404
+                elif self.command == 'HEAD' and _fraction(path + '!') < stub.head_rejected_rate:
+                    status = 405
+                else:
+                    status = 200
+                    body = b'\0' * 4096
+                    content_type = 'application/zip'
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body and body:
+                    self.wfile.write(body)
+
+            def do_HEAD(self):
+                self._respond(False)
+
+            def do_GET(self):
+                self._respond(True)
+
+        return Handler
+
+    def _get_records(self, query):
+        params = dict(urllib.parse.parse_qsl(query))
+        start = int(params.get('startPosition', 1))
+        with self._lock:
+            self.csw_starts.append(start)
+        if self.csw_fail_from is not None and start >= self.csw_fail_from:
+            return 503, b''
+        total = len(self.csw_records)
+        count = max(min(int(params.get('maxRecords', 10)), self.csw_page_cap, total - start + 1), 0)
+        records = ''.join(xml.split('?>', 1)[-1] for xml in self.csw_records[start - 1:start - 1 + count])
+        next_record = start + count if start + count <= total else 0
+        body = CSW_TEMPLATE.format(matched=total, returned=count, next=next_record, records=records)
+        return 200, body.encode('utf-8')
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-Stub mit Latenz und Ausfällen")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--failure-rate', type=float, default=0.1)
+    args = parser.parse_args()
+    with StubServer(args.latency, args.failure_rate, port=args.port) as server:
+        print(f"Stub läuft unter {server.base_url} (Strg+C beendet)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
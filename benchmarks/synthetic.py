@@ -0,0 +1,127 @@
+# Generator für synthetische ISO-19139-/19119-Metadatensätze
+#
+#   python benchmarks/synthetic.py ZIELVERZEICHNIS [--records N] [--keywords N] [--online N] [--base-url URL]
+#
+# Die Datensätze sind reproduzierbar (--seed) und mischen Datensatz- und Dienstbeschreibungen,
+# Lizenztexte, Formatangaben und transferOptions so, wie sie in Harvests vorkommen.
+import argparse
+import os
+import random
+from xml.sax.saxutils import escape
+
+LICENSE_TEXTS = [
+    "Datenlizenz Deutschland – Zero – Version 2.0",
+    "Datenlizenz Deutschland – Namensnennung – Version 2.0",
+    "cc-by 4.0",
+    "Es gelten keine Bedingungen",
+    '{"id": "dl-by-de/2.0", "name": "Datenlizenz Deutschland Namensnennung 2.0", "url": "https://www.govdata.de/dl-de/by-2-0"}',
+    "Nutzungsbedingungen: siehe Webseite des Anbieters",
+    "Keine Beschränkungen"
+]
+
+FORMATS = [
+    "GML", "Shapefile ", "GeoJSON ", "CSV", "GeoTIFF", "WMS", "WFS", "atom", "json", "xlsx",
+    "sqlite", "PDF", "file geodatabase", "NetCDF", "unbekannt", ""
+]
+
+GEO_CODES = ["053340002002", "091620000000", "110000000000", "276", "Deutschland", "Kreis Aachen", "999999999999"]
+
+DIRECT_EXTENSIONS = ['.zip', '.csv', '.gml', '.xml', '.geojson', '.json']
+
+HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+          '<gmd:MD_Metadata xmlns:gmd="http://www.isotc211.org/2005/gmd" '
+          'xmlns:gco="http://www.isotc211.org/2005/gco" xmlns:srv="http://www.isotc211.org/2005/srv" '
+          'xmlns:gml="http://www.opengis.net/gml"{extra_ns}>\n')
+
+def _cs(value):
+    return f'<gco:CharacterString>{escape(value)}</gco:CharacterString>'
+
+def generate_record(i, rng, keywords=20, online=2, direct_ratio=0.6, service_ratio=0.2,
+                    base_url='https://example.org', license_texts=None, formats=None):
+    # ein Datensatz als XML-Text; i macht Identifikatoren und URLs eindeutig
+    license_texts = license_texts or LICENSE_TEXTS
+    formats = formats or FORMATS
+    service = rng.random() < service_ratio
+    extra_ns = ' xmlns:dct="http://purl.org/dc/terms/"' if rng.random() < 0.1 else ''
+    standard = rng.choice(["ISO 19115", "ISO 19115:2003/19139", "ISO 19119", "INSPIRE", "ISO 19115"])
+    parts = [HEADER.format(extra_ns=extra_ns)]
+    parts.append(f'  <gmd:fileIdentifier>{_cs(f"record-{i:06d}")}</gmd:fileIdentifier>\n')
+    parts.append(f'  <gmd:dateStamp><gco:Date>2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}</gco:Date></gmd:dateStamp>\n')
+    parts.append(f'  <gmd:metadataStandardName>{_cs(standard)}</gmd:metadataStandardName>\n')
+    parts.append(f'  <gmd:metadataStandardVersion>{_cs("2003/Cor.1:2006")}</gmd:metadataStandardVersion>\n')
+    ident = 'srv:SV_ServiceIdentification' if service else 'gmd:MD_DataIdentification'
+    parts.append(f'  <gmd:identificationInfo><{ident}>\n')
+    parts.append('    <gmd:citation><gmd:CI_Citation>'
+                 f'<gmd:title>{_cs(f"Synthetischer Datensatz {i}")}</gmd:title>'
+                 '<gmd:date><gmd:CI_Date><gmd:date><gco:DateTime>2023-01-02T00:00:00</gco:DateTime></gmd:date></gmd:CI_Date></gmd:date>'
+                 '</gmd:CI_Citation></gmd:citation>\n')
+    parts.append(f'    <gmd:abstract>{_cs(f"Beschreibung des Datensatzes {i}. " * rng.randint(1, 5))}</gmd:abstract>\n')
+    parts.append('    <gmd:pointOfContact><gmd:CI_ResponsibleParty>'
+                 f'<gmd:organisationName>{_cs(rng.choice(["Landesamt", "Stadt Köln", "Kreis Wesel"]))}</gmd:organisationName>'
+                 '<gmd:contactInfo><gmd:CI_Contact><gmd:address><gmd:CI_Address>'
+                 f'<gmd:electronicMailAddress>{_cs("info@example.org")}</gmd:electronicMailAddress>'
+                 '</gmd:CI_Address></gmd:address></gmd:CI_Contact></gmd:contactInfo>'
+                 '</gmd:CI_ResponsibleParty></gmd:pointOfContact>\n')
+    for k in range(keywords):
+        parts.append(f'    <gmd:descriptiveKeywords><gmd:MD_Keywords><gmd:keyword>{_cs(f"Schlagwort {k}")}'
+                     '</gmd:keyword></gmd:MD_Keywords></gmd:descriptiveKeywords>\n')
+    for text in rng.sample(license_texts, rng.randint(1, 2)):
+        parts.append('    <gmd:resourceConstraints><gmd:MD_LegalConstraints>'
+                     f'<gmd:otherConstraints>{_cs(text)}</gmd:otherConstraints>'
+                     '</gmd:MD_LegalConstraints></gmd:resourceConstraints>\n')
+    if service:
+        parts.append(f'    <srv:identifier>{_cs(f"https://registry.example.org/service/{i}")}</srv:identifier>\n')
+    parts.append('    <gmd:extent><gmd:EX_Extent><gmd:geographicElement><gmd:EX_GeographicDescription>'
+                 '<gmd:geographicIdentifier><gmd:MD_Identifier>'
+                 f'<gmd:code>{_cs(rng.choice(GEO_CODES))}</gmd:code>'
+                 '</gmd:MD_Identifier></gmd:geographicIdentifier>'
+                 '</gmd:EX_GeographicDescription></gmd:geographicElement></gmd:EX_Extent></gmd:extent>\n')
+    parts.append(f'  </{ident}></gmd:identificationInfo>\n')
+    parts.append('  <gmd:distributionInfo><gmd:MD_Distribution>\n')
+    parts.append('    <gmd:distributionFormat><gmd:MD_Format>'
+                 f'<gmd:name>{_cs(rng.choice(formats))}</gmd:name>'
+                 '</gmd:MD_Format></gmd:distributionFormat>\n')
+    parts.append('    <gmd:transferOptions><gmd:MD_DigitalTransferOptions>\n')
+    for n in range(online):
+        if rng.random() < direct_ratio:
+            url = f'{base_url}/files/{i}/{n}{rng.choice(DIRECT_EXTENSIONS)}'
+        else:
+            url = f'{base_url}/index/{i % 50}/'
+        parts.append(f'      <gmd:onLine><gmd:CI_OnlineResource><gmd:linkage><gmd:URL>{escape(url)}</gmd:URL>'
+                     '</gmd:linkage></gmd:CI_OnlineResource></gmd:onLine>\n')
+    parts.append('    </gmd:MD_DigitalTransferOptions></gmd:transferOptions>\n')
+    parts.append('  </gmd:MD_Distribution></gmd:distributionInfo>\n</gmd:MD_Metadata>\n')
+    return ''.join(parts)
+
+def generate_records(count, seed=0, **options):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield generate_record(i, rng, **options)
+
+def write_catalog(directory, count, seed=0, **options):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, xml in enumerate(generate_records(count, seed, **options)):
+        path = os.path.join(directory, f'record_{i:06d}.xml')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(xml)
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische ISO-19139-/19119-Datensätze erzeugen")
+    parser.add_argument('directory')
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--keywords', type=int, default=20, help='Schlagwort-Elemente je Datensatz (Dateigröße)')
+    parser.add_argument('--online', type=int, default=2, help='CI_OnlineResource-Einträge je Datensatz')
+    parser.add_argument('--direct-ratio', type=float, default=0.6, help='Anteil direkter Datei-Links')
+    parser.add_argument('--service-ratio', type=float, default=0.2, help='Anteil Dienstbeschreibungen (ISO 19119)')
+    parser.add_argument('--base-url', default='https://example.org')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_catalog(args.directory, args.records, args.seed, keywords=args.keywords, online=args.online,
+                  direct_ratio=args.direct_ratio, service_ratio=args.service_ratio, base_url=args.base_url)
+    print(f"{args.records} Datensätze geschrieben nach {args.directory}")
+
+if __name__ == "__main__":
+    main()
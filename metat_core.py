@@ -0,0 +1,1051 @@
+# Kern von metat: Parsen, Feldextraktion, Mapping, FAIR-Regeln und Pipeline-Helfer.
+# Ohne GUI, Netzwerk und Excel; pandas/numpy werden erst für die FAIR-Bewertung geladen,
+# damit Worker-Prozesse und kurze CLI-Aufrufe schnell starten.
+import os
+import re
+import json
+import csv
+import hashlib
+import io
+import itertools
+import threading
+import bisect
+import contextlib
+import copy
+import functools
+import operator
+import time
+import urllib.parse
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from lxml import etree
+
+# === Namespaces ===
+namespaces = {
+    'gmd': "http://www.isotc211.org/2005/gmd",
+    'gco': "http://www.isotc211.org/2005/gco",
+    'srv': "http://www.isotc211.org/2005/srv"
+}
+
+# === Laufzeit-Metriken (--profile) ===
+# Obergrenzen der Latenz-Histogramm-Klassen in Sekunden
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf')]
+
+_NO_TIMER = contextlib.nullcontext()
+
+class Metrics:
+    # Zeiten je Stufe, Zähler und Latenz-Histogramme je Host. Ausgeschaltet liefert timer()
+    # einen geteilten Null-Kontext und count()/observe_http() kehren sofort zurück.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.hosts = {}
+
+    def timer(self, stage):
+        return self._timer(stage) if self.enabled else _NO_TIMER
+
+    @contextlib.contextmanager
+    def _timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stage_seconds[stage] += elapsed
+                self.stage_calls[stage] += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def observe_http(self, url, seconds):
+        if not self.enabled or seconds is None:
+            return
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            h = self.hosts.setdefault(host, {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(LATENCY_BUCKETS)})
+            h['count'] += 1
+            h['sum'] += seconds
+            h['max'] = max(h['max'], seconds)
+            h['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def snapshot(self):
+        # übertragbarer Zustand, z. B. aus Worker-Prozessen
+        with self._lock:
+            return {
+                'stage_seconds': dict(self.stage_seconds),
+                'stage_calls': dict(self.stage_calls),
+                'counters': dict(self.counters),
+                'hosts': {host: dict(h, buckets=list(h['buckets'])) for host, h in self.hosts.items()}
+            }
+
+    def merge(self, snapshot):
+        with self._lock:
+            for stage, seconds in snapshot['stage_seconds'].items():
+                self.stage_seconds[stage] += seconds
+            for stage, calls in snapshot['stage_calls'].items():
+                self.stage_calls[stage] += calls
+            for name, n in snapshot['counters'].items():
+                self.counters[name] += n
+            for host, other in snapshot['hosts'].items():
+                h = self.hosts.setdefault(host, {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(LATENCY_BUCKETS)})
+                h['count'] += other['count']
+                h['sum'] += other['sum']
+                h['max'] = max(h['max'], other['max'])
+                h['buckets'] = [a + b for a, b in zip(h['buckets'], other['buckets'])]
+
+    def report(self, wall_seconds, records):
+        # Stufenzeiten aus Worker-Prozessen und Threads überlappen sich; der Anteil kann
+        # daher in Summe über 100 % liegen
+        snap = self.snapshot()
+        labels = [f'<={b:g}s' if b != float('inf') else f'>{LATENCY_BUCKETS[-2]:g}s' for b in LATENCY_BUCKETS]
+        return {
+            'wall_seconds': round(wall_seconds, 3),
+            'records': records,
+            'records_per_s': round(records / max(wall_seconds, 1e-9), 2),
+            'stages': {
+                stage: {
+                    'seconds': round(seconds, 3),
+                    'calls': snap['stage_calls'][stage],
+                    'share': round(seconds / max(wall_seconds, 1e-9), 3)
+                }
+                for stage, seconds in sorted(snap['stage_seconds'].items(), key=lambda kv: -kv[1])
+            },
+            'counters': snap['counters'],
+            'hosts': {
+                host: {
+                    'requests': h['count'],
+                    'mean_s': round(h['sum'] / h['count'], 4),
+                    'max_s': round(h['max'], 4),
+                    'histogram': dict(zip(labels, h['buckets']))
+                }
+                for host, h in sorted(snap['hosts'].items())
+            }
+        }
+
+def print_report(report):
+    print(f"\n=== Profil: {report['records']} Datensätze in {report['wall_seconds']} s "
+          f"({report['records_per_s']} Datensätze/s) ===")
+    for stage, data in report['stages'].items():
+        print(f"  {stage:<14}{data['seconds']:>10.3f} s {data['share'] * 100:>7.1f} %  ({data['calls']} Aufrufe)")
+    for name, n in sorted(report['counters'].items()):
+        print(f"  {name}: {n}")
+    for host, data in report['hosts'].items():
+        buckets = ', '.join(f"{label}: {n}" for label, n in data['histogram'].items() if n)
+        print(f"  {host}: {data['requests']} Anfragen, Mittel {data['mean_s']} s, max {data['max_s']} s [{buckets}]")
+
+METRICS = Metrics()
+
+# === Geparster Metadatensatz (ein lxml-Parse pro Datei) ===
+class ParsedRecord:
+    # root: lxml-Wurzelelement, ns_uris: Namespace-URIs der verwendeten Element-Tags (nicht bloß deklarierte)
+    def __init__(self, root, ns_uris, source=None):
+        self.root = root
+        self.ns_uris = frozenset(ns_uris)
+        self.source = source
+        self.fields = None  # Ergebnis von FieldExtractor.extract, einmal pro Datensatz
+
+    def find(self, path, namespaces=None):
+        return self.root.find(path, namespaces)
+
+    def findall(self, path, namespaces=None):
+        return self.root.findall(path, namespaces)
+
+def parse_record(file_path):
+    # Namespaces der tatsächlich verwendeten Element-Tags (wie früher root.iter()), gesammelt über
+    # start-Events beim Parsen; nur deklarierte, aber ungenutzte Präfixe zählen nicht
+    with METRICS.timer('parse'):
+        context = etree.iterparse(file_path, events=('start',))
+        ns_uris = {etree.QName(el).namespace for _, el in context}
+        ns_uris.discard(None)
+    return ParsedRecord(context.root, ns_uris, source=file_path)
+
+def iter_file_records(file_path):
+    # Streamt eine Datei mit beliebig vielen gmd:MD_Metadata (z. B. gespeicherte GetRecords-Antworten)
+    # und liefert jeden Datensatz als (ID, XML-Bytes). Bereits gelieferte Elemente und ihre
+    # Vorgänger werden sofort verworfen, der Speicherbedarf bleibt unabhängig von der Dateigröße.
+    tag = f'{{{namespaces["gmd"]}}}MD_Metadata'
+    position = 0
+    for _, el in etree.iterparse(file_path, events=('end',), tag=tag):
+        position += 1
+        yield f'{file_path}#{position}', record_bytes(el)
+        el.clear(keep_tail=False)
+        parent = el.getparent()
+        while el.getprevious() is not None:
+            del parent[0]
+
+def record_bytes(el):
+    # eingebetteten Datensatz eigenständig serialisieren: tostring() übernimmt sonst alle
+    # Namespace-Deklarationen der Hülle (Sammeldatei, GetRecords-Antwort); ungenutzte werden
+    # entfernt. Präfixe aus namespaces bleiben, sie können in Attributwerten (xsi:type) stehen.
+    record = copy.deepcopy(el)
+    etree.cleanup_namespaces(record, keep_ns_prefixes=list(namespaces))
+    return etree.tostring(record)
+
+def source_id(source):
+    # Quellen sind Dateipfade oder (ID, XML-Bytes) für Datensätze, die nur im Speicher existieren
+    return source[0] if isinstance(source, tuple) else source
+
+def parse_source(source):
+    if isinstance(source, tuple):
+        record = parse_record(io.BytesIO(source[1]))
+        record.source = source[0]
+        return record
+    return parse_record(source)
+
+# === Normalisierung: ein kombinierter Ausdruck je Tabelle, Ergebnisse im LRU-Memo ===
+# Kataloge wiederholen wenige hundert Format- und Lizenztexte über tausende Datensätze
+NORMALIZE_CACHE_SIZE = 4096
+
+class PatternTable:
+    # wie re.search über die Muster nacheinander: der erste passende Eintrag der Tabelle gewinnt,
+    # nicht die früheste Fundstelle. Jede Alternative ist ein Lookahead am Textanfang, die leere
+    # Gruppe dahinter verrät, welche Alternative gegriffen hat.
+    def __init__(self, table):
+        self.values = list(table.values())
+        self.matcher = re.compile(r'\A(?:' + '|'.join(
+            rf'(?=[\s\S]*?(?:{pattern}))(?P<m{i}>)' for i, pattern in enumerate(table)
+        ) + ')')
+
+    def lookup(self, text):
+        match = self.matcher.match(text)
+        return None if match is None else self.values[int(match.lastgroup[1:])]
+
+def map_unique(series, fn):
+    # Batch-Variante für pandas-Spalten: jeder unterschiedliche Wert wird nur einmal normalisiert,
+    # fehlende Werte bleiben fehlend
+    mapping = {value: fn(value) for value in series.dropna().unique()}
+    return series.map(mapping)
+
+# === Lizenz-Mapping ===
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+def normalize_license_text(text):
+    return _NON_ALNUM.sub('', text.lower())
+
+LICENSE_MAP = {
+    normalize_license_text("datenlizenz deutschland – zero – version 2.0"): "https://www.govdata.de/dl-de/zero-2-0",
+    normalize_license_text("datenlizenz deutschland – namensnennung – version 2.0"): "https://www.govdata.de/dl-de/by-2-0",
+    normalize_license_text("cc-by 4.0"): "https://creativecommons.org/licenses/by/4.0/",
+    normalize_license_text("es gelten keine bedingungen"): "https://www.govdata.de/dl-de/zero-2-0"
+}
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def map_license_url(freetext):
+    if not freetext:
+        return None
+    freetext = freetext.strip()
+    # nur ein JSON-Objekt kann eine url liefern; Freitext nicht erst durch den JSON-Parser schicken
+    if freetext.startswith('{'):
+        try:
+            parsed = json.loads(freetext)
+            if isinstance(parsed, dict) and 'url' in parsed:
+                return parsed['url']
+        except json.JSONDecodeError:
+            pass
+    normalized = normalize_license_text(freetext)
+    return LICENSE_MAP.get(normalized, "manuell prüfen")
+
+# === Feld-Extraktionsplan: Ausgabespalte -> XPaths in Fallback-Reihenfolge ===
+FIELD_PLAN = {
+    'geo_raw': [
+        './/gmd:extent//gmd:EX_Extent//gmd:description/gco:CharacterString',
+        './/gmd:EX_Extent/gmd:description/gco:CharacterString',
+        './/gmd:extent//gmd:description/gco:CharacterString',
+        './/gmd:EX_GeographicDescription//gmd:MD_Identifier//gmd:code/gco:CharacterString',
+        './/gmd:country/gco:CharacterString'
+    ],
+    'Metadatensatz_ID': ['.//srv:identifier/gco:CharacterString'],
+    'Datensatz_ID': ['.//gmd:fileIdentifier/gco:CharacterString'],
+    'Titel': ['.//gmd:title/gco:CharacterString'],
+    'Beschreibung': ['.//gmd:abstract/gco:CharacterString'],
+    'Herausgeber': ['.//gmd:pointOfContact//gmd:organisationName/gco:CharacterString'],
+    'Kontakt E-Mail': ['.//gmd:electronicMailAddress/gco:CharacterString'],
+    'Metadatenstandard': ['.//gmd:metadataStandardName/gco:CharacterString'],
+    'Metadatenstandardversion': ['.//gmd:metadataStandardVersion/gco:CharacterString'],
+    'Veröffentlichungsdatum': ['.//gmd:date//gco:DateTime'],
+    'Letzte Aktualisierung': ['.//gmd:dateStamp/gco:Date'],
+    # nur für den Duplikat-Index (neuester dateStamp gewinnt); viele Datensätze nutzen gco:DateTime
+    'date_stamp': ['.//gmd:dateStamp/gco:DateTime', './/gmd:dateStamp/gco:Date'],
+    'format_raw': ['.//gmd:distributionFormat//gmd:name/gco:CharacterString']
+}
+
+# Felder mit allen Treffern statt nur dem ersten
+LIST_FIELD_PLAN = {
+    'license_texts': ['.//gmd:resourceConstraints//gmd:otherConstraints/gco:CharacterString'],
+    # erste gmd:URL je CI_OnlineResource, wie bisher res.find('.//gmd:URL')
+    'online_urls': ['.//gmd:transferOptions//gmd:onLine//gmd:CI_OnlineResource/descendant::gmd:URL[1]']
+}
+
+def _element_text(el):
+    return el.text.strip() if el is not None and el.text else None
+
+# Die Pläne nutzen nur Namensschritte mit / und // (und descendant::x[1] als letzten Schritt);
+# daraus wird ein Schrittpfad [(Achse, Clark-Tag, nur erster Treffer je Vorgänger), ...]
+_PATH_STEP = re.compile(r'(//|/)(descendant::)?(\w+):(\w+)(\[1\])?')
+
+def _compile_path(xpath):
+    steps, pos = [], 1
+    while xpath.startswith('.') and pos < len(xpath) and not (steps and steps[-1][2]):
+        m = _PATH_STEP.match(xpath, pos)
+        if not m:
+            break
+        axis = '//' if m.group(1) == '//' or m.group(2) else '/'
+        steps.append((axis, f'{{{namespaces[m.group(3)]}}}{m.group(4)}', bool(m.group(5))))
+        pos = m.end()
+    if not steps or pos < len(xpath):
+        raise ValueError(f"Nicht unterstützter Pfad im Extraktionsplan: {xpath}")
+    return steps
+
+def _step_parents(el, axis, root):
+    # Kandidaten für den vorigen Schritt: Elternelement (/) oder alle Vorfahren (//) unterhalb von root
+    parent = el.getparent()
+    while parent is not None and parent is not root:
+        yield parent
+        if axis == '/':
+            break
+        parent = parent.getparent()
+
+def _matches(el, steps, i, root):
+    # el trägt den Tag von steps[i]; passen auch die Vorfahren zu steps[:i]?
+    axis = steps[i][0]
+    if i == 0:
+        return axis == '//' or el.getparent() is root
+    tag = steps[i - 1][1]
+    return any(a.tag == tag and _matches(a, steps, i - 1, root) for a in _step_parents(el, axis, root))
+
+def _document_position(el):
+    # Indexpfad ab der Wurzel; sortiert Elemente in Dokumentreihenfolge
+    path = []
+    parent = el.getparent()
+    while parent is not None:
+        path.append(parent.index(el))
+        el, parent = parent, parent.getparent()
+    return path[::-1]
+
+class FieldExtractor:
+    # Übersetzt den Plan einmal in Schrittpfade; extract() füllt alle Felder eines Datensatzes in
+    # einem Durchlauf über die Elemente mit den Ziel-Tags (statt einer Suche je Feld und XPath).
+    # Ergebnis wie bei (xpath)[1] bzw. allen Treffern von xpath, jeweils in Dokumentreihenfolge.
+    def __init__(self, plan=None, list_plan=None):
+        plan = FIELD_PLAN if plan is None else plan
+        list_plan = LIST_FIELD_PLAN if list_plan is None else list_plan
+        self.plan = {field: [_compile_path(xpath) for xpath in xpaths] for field, xpaths in plan.items()}
+        self.list_plan = {field: [_compile_path(xpath) for xpath in xpaths] for field, xpaths in list_plan.items()}
+        # Tag -> [((Feld, Index), Schritte, Liste?)]. Endet ein Pfad mit /-Schritt, wird über den
+        # Eltern-Tag gesucht: fast alle Pfade enden auf gco:CharacterString, das in jedem Datensatz
+        # hundertfach vorkommt (Schlagwörter), während gmd:title, gmd:abstract usw. selten sind.
+        self._targets = defaultdict(list)
+        self._parent_targets = defaultdict(list)
+        for plans, is_list in ((self.plan, False), (self.list_plan, True)):
+            for field, paths in plans.items():
+                for index, steps in enumerate(paths):
+                    target = ((field, index), steps, is_list)
+                    if len(steps) > 1 and steps[-1][0] == '/':
+                        self._parent_targets[steps[-2][1]].append(target)
+                    else:
+                        self._targets[steps[-1][1]].append(target)
+        self._tags = tuple(set(self._targets) | set(self._parent_targets))
+
+    def extract(self, record):
+        if record.fields is not None:
+            return record.fields
+        with METRICS.timer('extract'):
+            record.fields = self._extract(record)
+        return record.fields
+
+    def _select(self, el, steps, root, seen):
+        n = len(steps) - 1
+        if not steps[n][2]:
+            return _matches(el, steps, n, root)
+        # descendant::x[1]: nur der erste Treffer unter jedem passenden Vorgänger
+        tag = steps[n - 1][1]
+        anchors = [a for a in _step_parents(el, '//', root) if a.tag == tag and _matches(a, steps, n - 1, root)]
+        fresh = [a for a in anchors if a not in seen]
+        seen.update(anchors)
+        return bool(fresh)
+
+    def _extract(self, record):
+        root = record.root
+        hits, seen, via_parent = defaultdict(list), defaultdict(set), set()
+        for el in (root.iter(*self._tags) if self._tags else ()):
+            if el is root:
+                continue
+            for key, steps, is_list in self._targets.get(el.tag, ()):
+                if (is_list or not hits[key]) and self._select(el, steps, root, seen[key]):
+                    hits[key].append(el)
+            for key, steps, is_list in self._parent_targets.get(el.tag, ()):
+                children = el.iterchildren(steps[-1][1])
+                if not is_list:
+                    children = itertools.islice(children, 1)
+                children = list(children)
+                if children and _matches(el, steps, len(steps) - 2, root):
+                    hits[key].extend(children)
+                    via_parent.add(key)
+        # Kinder verschiedener Elternelemente in Dokumentreihenfolge bringen (Eltern können verschachtelt sein)
+        for key in via_parent:
+            if len(hits[key]) > 1:
+                hits[key].sort(key=_document_position)
+        fields = {}
+        for field, paths in self.plan.items():
+            value = None
+            for index in range(len(paths)):
+                value = _element_text(next(iter(hits.get((field, index), ())), None))
+                if value:
+                    break
+            fields[field] = value
+        for field, paths in self.list_plan.items():
+            fields[field] = [v for index in range(len(paths)) for v in map(_element_text, hits.get((field, index), ())) if v]
+        return fields
+
+FIELD_EXTRACTOR = FieldExtractor()
+
+# === DCAT-AP-konforme URL-Unterscheidung ===
+def get_dcat_urls_strict(record):
+    download_url = None
+    access_url = None
+    for url in FIELD_EXTRACTOR.extract(record)['online_urls']:
+        url_lower = url.lower()
+        is_direct_file = any(url_lower.endswith(ext) for ext in ['.zip', '.csv', '.gml', '.xml', '.geojson', '.json'])
+        if is_direct_file:
+            if not download_url:
+                download_url = url
+        else:
+            if not access_url:
+                access_url = url
+    return download_url, access_url
+
+def get_text(record, xpath):
+    el = record.find(xpath, namespaces)
+    return el.text.strip() if el is not None and el.text else None
+
+
+
+# === INSPIRE-/ISO-Prüfung ===
+def is_inspire_conform(record):
+    std = FIELD_EXTRACTOR.extract(record)['Metadatenstandard']
+    if not std:
+        return False
+    std = std.lower()
+    return any(key in std for key in ['iso 19115', 'iso19115', 'iso 19119', 'iso19119', 'inspire'])
+
+# === XPath-Helfer ===
+def get_text_debug(record, xpath):
+    el = record.find(xpath, namespaces)
+    if el is not None and el.text:
+        print(f"[DEBUG] Found text for {xpath}: {el.text.strip()}")
+        return el.text.strip()
+    else:
+        print(f"[DEBUG] Nothing found for {xpath}")
+        return None
+
+# === FAIR-Indikatoren ===
+I1_02M_NAMESPACES = {
+    "http://www.w3.org/ns/dcat#", "http://schema.org/",
+    "http://www.w3.org/2004/02/skos/core#", "http://purl.org/dc/terms/",
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#", "http://www.w3.org/2002/07/owl#"
+}
+
+I2_01M_NAMESPACES = {
+    "http://www.isotc211.org/2005/gmd", "http://www.opengis.net/gml",
+    "http://www.isotc211.org/2005/gco", "http://www.w3.org/ns/dcat#",
+    "http://purl.org/dc/terms/"
+}
+
+# Medientypen, die RDA-R1.3-01D als gemeinschaftsübliches Datenformat gelten lässt (Teilstring-Vergleich)
+R1_3_01D_FORMATS = [
+    'application/x-esri-shapefile', 'application/geo+json', 'application/gml+xml', 'text/csv',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'text/xml', 'RDF', 'OGC:WFS',
+    'OGC:WMS', 'application/json'
+]
+
+# === FAIR-Indikatoren als Regeltabelle ===
+# Eine Regel bekommt den DataFrame mit den Zeilen (ohne RDA-Spalten) und liefert eine boolesche
+# Serie; ein String verweist auf eine andere Regel mit identischer Bedeutung.
+# Versteckte Eingabespalten mit "_" werden von make_entries gefüllt und nicht ausgegeben.
+def _text(frame, column):
+    import pandas as pd
+    if column not in frame:
+        return pd.Series('', index=frame.index)
+    return frame[column].fillna('').astype(str)
+
+def present(*columns):
+    # mindestens eine der Spalten ist nicht leer
+    return lambda frame: functools.reduce(operator.or_, (_text(frame, c) != '' for c in columns))
+
+def all_present(*columns):
+    return lambda frame: functools.reduce(operator.and_, (_text(frame, c) != '' for c in columns))
+
+def starts_with(column, *prefixes):
+    pattern = '|'.join(map(re.escape, prefixes))
+    return lambda frame: _text(frame, column).str.match(pattern)
+
+def contains_any(column, needles, case=True):
+    pattern = '|'.join(map(re.escape, needles))
+    return lambda frame: _text(frame, column).str.contains(pattern, case=case, regex=True)
+
+def has_token(column, tokens):
+    # exakter Vergleich mit leerzeichengetrennten Einträgen (z. B. Namespace-URIs)
+    pattern = '|'.join(' ' + re.escape(t) + ' ' for t in tokens)
+    return lambda frame: (' ' + _text(frame, column) + ' ').str.contains(pattern, regex=True)
+
+def any_of(*rules):
+    return lambda frame: functools.reduce(operator.or_, (rule(frame) for rule in rules))
+
+FAIR_RULES = {
+    'RDA-F1-01M': present('Datensatz_ID'),
+    'RDA-F1-01D': present('Metadatensatz_ID'),
+    'RDA-F1-02M': starts_with('Datensatz_ID', 'http'),
+    'RDA-F1-02D': starts_with('Metadatensatz_ID', 'http'),
+    'RDA-F2-01M': all_present('_title', 'Beschreibung', 'Format', 'Lizenz'),
+    'RDA-F3-01M': present('Datensatz_ID', 'Zugriffs-URL'),
+    'RDA-A1-01M': present('_download_url', 'Zugriffs-URL'),
+    'RDA-A1-02M': present('Kontakt E-Mail', '_download_url', 'Zugriffs-URL'),
+    'RDA-A1-02D': 'RDA-A1-02M',
+    'RDA-A1-04M': starts_with('_download_url', 'http'),
+    'RDA-A1-04D': 'RDA-A1.1-01D',
+    'RDA-A1.1-01M': 'RDA-A1-04M',
+    'RDA-A1.1-01D': any_of(starts_with('_download_url', 'http', 'ftp'), starts_with('Zugriffs-URL', 'http', 'ftp')),
+    'RDA-I1-01M': present('Metadatenstandard'),
+    'RDA-I1-02M': has_token('_namespaces', I1_02M_NAMESPACES),
+    'RDA-I2-01M': has_token('_namespaces', I2_01M_NAMESPACES),
+    'RDA-R1.1-01M': present('Lizenz'),
+    'RDA-R1.3-01M': 'RDA-I1-01M',
+    'RDA-R1.3-01D': any_of(contains_any('Format', R1_3_01D_FORMATS), contains_any('_content_type', R1_3_01D_FORMATS)),
+    'RDA-R1.3-02M': contains_any('Metadatenstandard', ['iso', 'iso/ts', 'rdf', 'owl', 'xsd', 'dcat'], case=False)
+}
+
+def evaluate_fair(frame, rules=FAIR_RULES):
+    # ganze Spalten auf einmal statt Zeile für Zeile; liefert eine Kopie mit 'ja'/'nein'-Spalten
+    import numpy as np
+    results = {}
+
+    def evaluate(name):
+        if name not in results:
+            rule = rules[name]
+            results[name] = evaluate(rule) if isinstance(rule, str) else rule(frame).to_numpy(dtype=bool)
+        return results[name]
+
+    return frame.assign(**{name: np.where(evaluate(name), 'ja', 'nein') for name in rules})
+
+def score_rows(rows):
+    # Zeilen aus make_entries -> vollständige Zeilen mit FAIR-Indikatoren, ohne versteckte Spalten
+    if not rows:
+        return []
+    import pandas as pd
+    frame = evaluate_fair(pd.DataFrame(rows))
+    frame = frame.drop(columns=[c for c in frame.columns if c.startswith('_')])
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+# === Manuelle Felder ohne Dialog (Batch-Modus) ===
+# Voreinstellungen wie im Dialog; Bundesland kommt aus der AGS-basierten geo_desc des Datensatzes
+MANUAL_DEFAULTS = {
+    'Kategorie': '',
+    'enthält synthetische Daten': 'ja',
+    'ist zugänglich ohne Zahlung': 'ja',
+    'ist zugänglich ohne Registrierung': 'ja',
+    'Erstellenart': 'amtlich'
+}
+
+YES_NO_FIELDS = ['enthält synthetische Daten', 'ist zugänglich ohne Zahlung', 'ist zugänglich ohne Registrierung']
+
+def _yes_no(value):
+    if isinstance(value, bool):
+        return 'ja' if value else 'nein'
+    return 'ja' if str(value).strip().lower() in ('ja', 'j', 'yes', 'y', 'true', 'wahr', '1', 'x') else 'nein'
+
+def load_answers(path):
+    # Antwortdatei (CSV oder JSON) -> {fileIdentifier: {Feld: Wert}}
+    # CSV: Spalte fileIdentifier (oder Datensatz_ID) plus beliebige manuelle Felder
+    # JSON: {"<fileIdentifier>": {...}} oder [{"fileIdentifier": ..., ...}, ...]
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        rows = [dict(v, fileIdentifier=k) for k, v in data.items()] if isinstance(data, dict) else data
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            header = f.readline()
+            f.seek(0)
+            delimiter = ';' if header.count(';') > header.count(',') else ','  # Excel-Export oft mit ;
+            rows = list(csv.DictReader(f, delimiter=delimiter))
+    answers = {}
+    for row in rows:
+        file_id = row.get('fileIdentifier') or row.get('Datensatz_ID')
+        if file_id:
+            answers[str(file_id).strip()] = row
+    return answers
+
+def answers_for(summary, answers):
+    # liefert dieselbe Struktur wie popup(); fehlende Angaben fallen auf die Voreinstellungen zurück
+    data = dict(MANUAL_DEFAULTS, Bundesland=summary['geo_desc'] or '')
+    answer = answers.get(summary['fields']['Datensatz_ID'] or '', {})
+    for key in data:
+        value = answer.get(key)
+        if value is None or value == '':
+            continue
+        if key in YES_NO_FIELDS:
+            value = _yes_no(value)
+        elif key == 'Kategorie' and isinstance(value, list):
+            value = '; '.join(value)
+        data[key] = str(value).strip()
+    return data
+
+# === Format / Service to Recommended DCAT Entry (IANA “Media Types” Vokabular) ===
+
+MEDIA_TYPES = {
+    r"\bShapefile \b": ["application/x-esri-shapefile"],
+    r"\bGeoPackage\b|\bGPKG\b": ["application/geopackage+sqlite3", "application/geopackage"],
+    r"\bGML\b": ["application/gml+xml"],
+    r"\bGeoJSON \b": ["application/geo+json"],
+    r"\bKML\b": ["application/vnd.google-earth.kml+xml"],
+    r"\bCSV\b": ["text/csv"],
+    r"\bNetCDF\b": ["application/x-netcdf"],
+    r"\bTIFF\b|\bGeoTIFF\b": ["image/tiff", "image/geotiff"],
+    r"\bJPEG2000\b|\bjp2\b": ["image/jp2"],
+    r"\bPDF\b": ["application/pdf"],
+    r"\bZIP\b": ["application/zip"],
+    r"\bXML\b": ["text/xml", "application/xml"],
+    r"\bWMS\b": ["OGC:WMS", "application/xml"],
+    r"\bWFS\b": ["OGC:WFS", "application/xml"],
+    r"\batom\b|inspire download service": ["application/atom+xml"],
+    r"\b(gdb|file geodatabase|geodatabase)\b": ["application/x-esri-filegdb"],
+    r"\bsqlite\b(?!.*geopackage)": ["application/vnd.sqlite3"],
+    r"\bjson\b(?!.*geojson)": ["application/json"],
+    r"\b(xlsx|excel)\b": ["application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]
+}
+
+MEDIA_TYPE_TABLE = PatternTable(MEDIA_TYPES)
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def recommended_dcat_entry(format_service: str) -> str:
+    if not format_service:
+        return ""
+    media_list = MEDIA_TYPE_TABLE.lookup(format_service.lower())
+    if media_list is not None:
+        return " | ".join(media_list)   # nhiều lựa chọn -> nối bằng " | "
+    return format_service  # fallback nếu không khớp
+
+# === Analyse eines Metadatensatzes (CPU-Teil: Parsen, Felder, Mapping, Namespace-Indikatoren) ===
+def analyze_record(source):
+    # source: Dateipfad, (ID, XML-Bytes) oder bereits geparster ParsedRecord
+    # Ergebnis ist ein einfaches dict, damit es aus Worker-Prozessen zurückgegeben werden kann
+    record = source if isinstance(source, ParsedRecord) else parse_source(source)
+    if not is_inspire_conform(record):
+        METRICS.count('übersprungen (nicht INSPIRE/ISO)')
+        return None
+    fields = FIELD_EXTRACTOR.extract(record)
+    geo_raw = fields['geo_raw']
+
+# === Bundesland-Mapping basierend auf 2-stelligem AGS-Code ===
+    BUNDESLAND_SCHLUESSEL = {
+        "01": "Schleswig-Holstein",
+        "02": "Hamburg",
+        "03": "Niedersachsen",
+        "04": "Bremen",
+        "05": "Nordrhein-Westfalen",
+        "06": "Hessen",
+        "07": "Rheinland-Pfalz",
+        "08": "Baden-Württemberg",
+        "09": "Bayern",
+        "10": "Saarland",
+        "11": "Berlin",
+        "12": "Brandenburg",
+        "13": "Mecklenburg-Vorpommern",
+        "14": "Sachsen",
+        "15": "Sachsen-Anhalt",
+        "16": "Thüringen"
+    }
+
+    geo_desc = None
+
+
+    if geo_raw:
+        if geo_raw.strip() == "276" or "deutschland" in geo_raw.lower():
+            geo_desc = "Deutschland"
+        elif re.fullmatch(r'\d{12}', geo_raw.strip()):
+            bl_code = geo_raw.strip()[:2]
+            bl_name = BUNDESLAND_SCHLUESSEL.get(bl_code)
+            if bl_name:
+                geo_desc = bl_name
+            else:
+                geo_desc = geo_raw  # Fallback
+        else:
+            geo_desc = geo_raw
+    else:
+        geo_desc = None
+
+
+
+    # === Lizenz korrekt aus allen möglichen Constraints extrahieren ===
+    license_url = None
+    for lt in fields['license_texts']:
+        license_url = map_license_url(lt)
+        if license_url and license_url != "manuell prüfen":
+            break
+    if not license_url:
+        license_url = "manuell prüfen"
+    if license_url == "manuell prüfen":
+        METRICS.count('Lizenz: manuell prüfen')
+
+    download_url, access_url = get_dcat_urls_strict(record)
+
+    return {
+        'fields': fields,
+        'geo_desc': geo_desc,
+        'license_url': license_url,
+        'download_url': download_url,
+        'access_url': access_url,
+        'format': recommended_dcat_entry(fields['format_raw']),
+        'namespaces': sorted(record.ns_uris)
+    }
+
+# === Einzelner Metadatensatz: Zeilen aus Analyse, aufgelösten URLs und manuellen Angaben ===
+def make_entries(summary, resolved, manual_data):
+    fields = summary['fields']
+    license_url = summary['license_url']
+    access_url = summary['access_url']
+    download_url = resolved['download_url']
+    download_files = resolved['download_files']
+    download_urls = resolved['download_urls']
+
+    file_id = fields['Datensatz_ID']
+    identifier = fields['Metadatensatz_ID']
+    title = fields['Titel']
+
+    data = {
+        'Übernommen von Appsmith': '',
+        'Metadatensatz_ID': identifier,
+        'Datensatz_ID': file_id,
+        'Titel': title,
+        'Beschreibung': fields['Beschreibung'],
+        'Kategorie': manual_data.get('Kategorie'),
+        'enthält synthetische Daten': manual_data.get('enthält synthetische Daten'),
+        'ist zugänglich ohne Zahlung': manual_data.get('ist zugänglich ohne Zahlung'),
+        'ist zugänglich ohne Registrierung': manual_data.get('ist zugänglich ohne Registrierung'),
+        'Erstellenart': manual_data.get('Erstellenart'),
+        'Geographische Beschreibung': manual_data.get('Bundesland'),
+        'Lizenz': license_url,
+        'Herausgeber': fields['Herausgeber'],
+        'Kontakt E-Mail': fields['Kontakt E-Mail'],
+        'Download-URL': download_url or resolved.get('download_note') or '',
+        'Zugriffs-URL': access_url,
+        'Metadatenstandard': fields['Metadatenstandard'],
+        'Metadatenstandardversion': fields['Metadatenstandardversion'],
+        'Veröffentlichungsdatum': fields['Veröffentlichungsdatum'],
+        'Letzte Aktualisierung': fields['Letzte Aktualisierung'],
+        'Erstellungsdatum des Metadatensatzes': fields['Letzte Aktualisierung'],
+        'Format': summary['format']
+    }
+
+    data.update({
+        'Eintragsdatum': datetime.now().strftime('%Y-%m-%d'),
+        'Keywords': '', 'Kommentar': '', 'Person': '', #changed
+        # Eingaben für die FAIR-Regeln (evaluate_fair), werden nicht ausgegeben
+        '_title': title,
+        '_download_url': download_url,
+        # vom Server gemeldeter Medientyp, nur für RDA-R1.3-01D
+        '_content_type': resolved.get('content_type') or '',
+        '_namespaces': ' '.join(summary['namespaces'])
+    })
+
+    entries = []
+    if download_files:
+        for file, url in zip(download_files, download_urls):
+            data['Titel'], data['Download-URL'] = file, url
+            entries.append(data.copy())
+    else:
+        entries.append(data)
+    return entries
+
+# === Pipeline-Helfer ===
+def bounded_map(executor, fn, iterable, depth):
+    # wie executor.map, aber höchstens depth Aufträge gleichzeitig unterwegs;
+    # die Reihenfolge bleibt erhalten und iterable wird nur so weit gelesen wie nötig
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+# === Parallele Analyse eines Verzeichnisses ===
+def _analyze_file(source):
+    # Fehler je Datei abfangen, damit eine defekte XML-Datei nicht den ganzen Lauf abbricht
+    try:
+        with METRICS.timer('analyze'):
+            return analyze_record(source), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _analyze_chunk(sources, profile=False, analyze=_analyze_file):
+    # läuft im Worker-Prozess; Metriken werden mitgeliefert und im Hauptprozess zusammengeführt
+    METRICS.enabled = profile
+    METRICS.reset()
+    results = [(source_id(source), *analyze(source)) for source in sources]
+    return results, METRICS.snapshot() if profile else None
+
+def analyze_files(files, workers=1, chunksize=8, analyze=_analyze_file):
+    # files: Dateipfade oder (ID, XML-Bytes), auch als Generator
+    # liefert (ID, summary, Fehler) in der Reihenfolge von files;
+    # es sind höchstens 2 * workers Pakete gleichzeitig in Arbeit.
+    # analyze: Funktion auf Modulebene (Quelle -> (Ergebnis, Fehler)), Standard ist die volle Analyse
+    if workers <= 1:
+        for source in files:
+            yield (source_id(source), *analyze(source))
+        return
+    files = iter(files)
+    chunks = iter(lambda: list(itertools.islice(files, chunksize)), [])
+    analyze_chunk = functools.partial(_analyze_chunk, profile=METRICS.enabled, analyze=analyze)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results, metrics in bounded_map(pool, analyze_chunk, chunks, 2 * workers):
+            if metrics:
+                METRICS.merge(metrics)
+            yield from results
+
+def merge_reused(order, reused, pipeline):
+    # führt wiederverwendete Manifest-Einträge und frisch verarbeitete Datensätze in der
+    # Reihenfolge von order zusammen; liefert (ID, summary, Fehler, resolved, Manifest-Eintrag)
+    if order is None:
+        for item in pipeline:
+            yield (*item, None)
+        return
+    for path in order:
+        if path in reused:
+            yield path, None, None, None, reused[path]
+        else:
+            yield (*next(pipeline), None)
+
+# === Inkrementelle Läufe: Manifest aus Pfad, Inhalts-Hash, fileIdentifier und erzeugten Zeilen ===
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+# Version 2: gespeicherte Zeilen sind Zeilen vor der FAIR-Bewertung (mit versteckten Spalten)
+MANIFEST_VERSION = 2
+
+def load_manifest(path):
+    # {Pfad: {'sha256': ..., 'file_id': ..., 'rows': [...]}}
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        print(f"Manifest {path} hat ein älteres Format; alle Dateien werden neu verarbeitet.")
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(path, files):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def split_unchanged(files, manifest):
+    # teilt files in unveränderte (Manifest-Eintrag wiederverwendbar) und neu zu verarbeitende;
+    # umbenannte Dateien werden über den Inhalts-Hash wiedererkannt
+    by_hash = {entry['sha256']: entry for entry in manifest.values()}
+    hashes = {path: file_sha256(path) for path in files}
+    reused, todo = {}, []
+    for path in files:
+        previous = manifest.get(path)
+        if previous is None or previous['sha256'] != hashes[path]:
+            previous = by_hash.get(hashes[path])
+        if previous is not None:
+            reused[path] = previous
+        else:
+            todo.append(path)
+    return reused, todo, hashes
+
+# === Journal: abgeschlossene Datensätze samt Dialog-Antworten, append-only ===
+JOURNAL_VERSION = 1
+
+class RunJournal:
+    # Eine JSON-Zeile je abgeschlossenem Datensatz (Quelle, Antworten, Zeilen vor der FAIR-Bewertung).
+    # Nach einem Abbruch (Ausnahme, geschlossener Dialog, beendeter Prozess) setzt derselbe Aufruf
+    # hinter dem letzten Eintrag fort; die Ausgabedatei wird am Ende aus dem Journal gebaut.
+    # append(sync=True) schreibt per fsync durch, sonst höchstens alle sync_interval Sekunden.
+    def __init__(self, path, run_input, sync_interval=1.0):
+        self.path = path
+        self.run_input = run_input
+        self.sync_interval = sync_interval
+        self._file = None
+        self._synced = 0.0
+
+    def open(self, restart=False):
+        # liefert {Quelle: Antworten} der bereits abgeschlossenen Datensätze
+        done, keep = {}, 0
+        if not restart and os.path.exists(self.path):
+            done, keep = self._read_done()
+        self._file = open(self.path, 'ab')
+        self._file.truncate(keep)
+        if not keep:
+            self._write(self._header(), sync=True)
+        return done
+
+    def _header(self):
+        return {'journal': JOURNAL_VERSION, 'input': self.run_input}
+
+    def _read_done(self):
+        # gültiger Anfang des Journals: (abgeschlossene Datensätze, Länge in Bytes)
+        done, keep = {}, 0
+        with open(self.path, 'rb') as f:
+            for n, line in enumerate(f):
+                if not line.endswith(b'\n'):
+                    break  # halb geschriebene letzte Zeile
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if n == 0 and entry != self._header():
+                    print(f"Journal {self.path} gehört zu einem anderen Lauf und wird neu begonnen.")
+                    return {}, 0
+                if n:
+                    done[entry['source']] = entry['answers']
+                keep += len(line)
+        return done, keep
+
+    def _write(self, entry, sync):
+        self._file.write(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        now = time.monotonic()
+        if sync or now - self._synced >= self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._synced = now
+
+    def append(self, source, answers, rows, sync=False, **extra):
+        self._write(dict(extra, source=source, answers=answers, rows=rows), sync)
+
+    def entries(self):
+        # alle abgeschlossenen Einträge in Journal-Reihenfolge, direkt von der Platte
+        with open(self.path, 'rb') as f:
+            next(f, None)
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        if self._file:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# === Duplikate über alle Eingaben: Index aus fileIdentifier, srv:identifier und URLs ===
+# newest: je Gruppe nur der Datensatz mit dem neuesten dateStamp (bei Gleichstand der erste)
+# share: alle Datensätze bleiben, der Dialog kommt einmal je Gruppe und gilt für alle Kopien
+# off: kein Vorab-Durchlauf
+# URLs werden unabhängig davon nur einmal pro Lauf geprüft (ReachabilityChecker/ListingResolver)
+DEDUP_POLICIES = ('newest', 'share', 'off')
+
+def normalize_date_stamp(value):
+    # gco:Date/gco:DateTime (auch nur Jahr oder Jahr-Monat, mit oder ohne Zeitzone) -> vergleichbarer
+    # ISO-Text in UTC; Angaben ohne Zeitzone gelten als UTC, unlesbare als '' (älter als alle anderen)
+    value = (value or '').strip()
+    if re.fullmatch(r'\d{4}(-\d{2})?', value):
+        value += '-01' * (2 - value.count('-'))
+    try:
+        stamp = datetime.fromisoformat(value)
+    except ValueError:
+        return ''
+    if stamp.tzinfo is not None:
+        stamp = stamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return stamp.isoformat(timespec='microseconds')
+
+def _index_file(source):
+    # Vorab-Durchlauf im Worker-Prozess: nur die Schlüssel für den Index
+    try:
+        record = parse_source(source)
+        if not is_inspire_conform(record):
+            return None, None
+        fields = FIELD_EXTRACTOR.extract(record)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return {
+        'file_id': fields['Datensatz_ID'],
+        'srv_id': fields['Metadatensatz_ID'],
+        'date_stamp': normalize_date_stamp(fields['date_stamp']),
+        'urls': fields['online_urls']
+    }, None
+
+class DedupIndex:
+    # Gruppen aus Datensätzen, die sich einen fileIdentifier oder srv:identifier teilen (transitiv);
+    # Gruppen-ID ist die erste Quelle der Gruppe in Eingabereihenfolge
+    def __init__(self, policy='share'):
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(f"Unbekannte Duplikat-Regel: {policy} (möglich: {', '.join(DEDUP_POLICIES)})")
+        self.policy = policy
+        self.groups = {}      # Quellen-ID -> Gruppen-ID, nur für Gruppen mit mehr als einem Datensatz
+        self.skipped = set()  # bei newest: verworfene Quellen-IDs
+        self.url_refs = defaultdict(int)
+
+    def build(self, keyed):
+        # keyed: (Quellen-ID, Schlüssel oder None, Fehler) in Eingabereihenfolge, z. B. aus
+        # analyze_files(..., analyze=_index_file)
+        order, parent, stamps, owners = {}, {}, {}, {}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for sid, keys, _ in keyed:
+            order[sid] = len(order)
+            parent[sid] = sid
+            if keys is None:
+                continue
+            stamps[sid] = keys['date_stamp']
+            for key in (('fileIdentifier', keys['file_id']), ('srv:identifier', keys['srv_id'])):
+                if not key[1]:
+                    continue
+                if key not in owners:
+                    owners[key] = sid
+                    continue
+                a, b = find(sid), find(owners[key])
+                if a != b:
+                    a, b = sorted((a, b), key=order.get)
+                    parent[b] = a
+            for url in dict.fromkeys(keys['urls']):
+                self.url_refs[url] += 1
+
+        members = defaultdict(list)
+        for sid in order:
+            members[find(sid)].append(sid)
+        for root, sids in members.items():
+            if len(sids) < 2:
+                continue
+            for sid in sids:
+                self.groups[sid] = root
+            if self.policy == 'newest':
+                # max() liefert bei Gleichstand den ersten Datensatz
+                keep = max(sids, key=lambda sid: stamps.get(sid, ''))
+                self.skipped.update(sid for sid in sids if sid != keep)
+        return self
+
+    def skip(self, sid):
+        return sid in self.skipped
+
+    def group_of(self, sid):
+        return self.groups.get(sid)
+
+    def summary(self):
+        duplicates = len(self.groups) - len(set(self.groups.values()))
+        shared_urls = sum(1 for n in self.url_refs.values() if n > 1)
+        return duplicates, shared_urls
@@ -0,0 +1,149 @@
+# Tk-Dialoge von metat; nur für den interaktiven Modus, braucht ein Display.
+import tkinter as tk
+from tkinter import filedialog
+from tkinter import ttk
+
+# Pop-up Fenster für manuelle Eingaben (3 pages: Kategorien -> Bundesland -> Optionen)
+def popup(title: str, geo_desc: str):
+    class Option(ttk.Frame):
+        def __init__(self, parent, text, variable):
+            super().__init__(parent)
+            ttk.Label(self, text=text).pack()
+            ttk.Radiobutton(self, text='ja', variable=variable, value=True).pack()
+            ttk.Radiobutton(self, text='nein', variable=variable, value=False).pack()
+            variable.set(True)
+
+    class Checkbox(ttk.Checkbutton):
+        def __init__(self, parent, text, variable):
+            super().__init__(parent, text=text, variable=variable, offvalue=False, onvalue=True)
+            self.pack(anchor="w")
+
+    # ----- Root-Fenster -----
+    root = tk.Tk()
+    root.title('Felder manuell eingeben')
+    root.geometry('360x480')
+
+    ttk.Label(root, text=title).pack(pady=6)
+
+
+    container = ttk.Frame(root)
+    container.pack(side='top', fill='both', expand=True)
+
+    page0 = ttk.Frame(container)
+    page1 = ttk.Frame(container)
+    page2 = ttk.Frame(container)
+
+    for p in (page0, page1, page2):
+        p.place(relx=0, rely=0, relwidth=1, relheight=1)
+
+    # ===== PAGE 0: Kategorien =====
+    ttk.Label(page0, text='Kategorien auswählen').pack(pady=4)
+
+    kategorien = {
+        'Gebiet': tk.BooleanVar(),
+        'Gebäude': tk.BooleanVar(),
+        'Klima': tk.BooleanVar(),
+        'Landwirtschaft': tk.BooleanVar(),
+        'Bildung': tk.BooleanVar(),
+        'Gesundheit': tk.BooleanVar(),
+        'Wirtschaft': tk.BooleanVar(),
+        'Bevölkerung': tk.BooleanVar(),
+        'Sicherheit': tk.BooleanVar(),
+        'Umwelt': tk.BooleanVar(),
+        'Energie': tk.BooleanVar(),
+        'Technologie': tk.BooleanVar(),
+        'Transport': tk.BooleanVar(),
+        'anderes': tk.BooleanVar()
+    }
+    for k in kategorien:
+        Checkbox(page0, k, kategorien[k])
+
+    # ===== PAGE 1: Wähle Bundesland (Combobox) =====
+    ttk.Label(page1, text='Wähle Bundesland').pack(pady=8)
+
+    BUNDESLAENDER = [
+        "Schleswig-Holstein","Hamburg","Niedersachsen","Bremen","Nordrhein-Westfalen",
+        "Hessen","Rheinland-Pfalz","Baden-Württemberg","Bayern","Saarland","Berlin",
+        "Brandenburg","Mecklenburg-Vorpommern","Sachsen","Sachsen-Anhalt","Thüringen"
+    ]
+    bundesland = tk.StringVar(value=geo_desc)
+    cb = ttk.Combobox(page1, values=BUNDESLAENDER, textvariable=bundesland, state="readonly", width=28)
+    cb.pack(pady=6)
+
+    # ===== PAGE 2 =====
+    synthetische_daten = tk.BooleanVar()
+    ohne_zahlung = tk.BooleanVar()
+    ohne_registrierung = tk.BooleanVar()
+
+    Option(page2, "enthält synthetische Daten", synthetische_daten).pack(pady=4)
+    Option(page2, "ist zugänglich ohne Zahlung", ohne_zahlung).pack(pady=4)
+    Option(page2, "ist zugänglich ohne Registrierung", ohne_registrierung).pack(pady=4)
+
+    rahmen = ttk.Frame(page2)
+    rahmen.pack(pady=6)
+    ttk.Label(rahmen, text='Erstellenart').pack()
+    erstellenart = tk.StringVar(value='amtlich')
+    ttk.Radiobutton(rahmen, text='amtlich', variable=erstellenart, value='amtlich').pack()
+    ttk.Radiobutton(rahmen, text='privat', variable=erstellenart, value='privat').pack()
+    ttk.Radiobutton(rahmen, text='crowdsourced', variable=erstellenart, value='crowdsourced').pack()
+
+    # ----- Navigation -----
+    pages = [page0, page1, page2]
+    idx = {'i': 0}
+    pages[0].lift()
+
+    def sammeln_und_schliessen():
+        # Kategorien zusammensetzen
+        category = '; '.join([k for k, v in kategorien.items() if v.get()])
+        data = {
+            'Kategorie': category,
+            'Bundesland': bundesland.get(),
+            'enthält synthetische Daten': 'ja' if synthetische_daten.get() else 'nein',
+            'ist zugänglich ohne Zahlung': 'ja' if ohne_zahlung.get() else 'nein',
+            'ist zugänglich ohne Registrierung': 'ja' if ohne_registrierung.get() else 'nein',
+            'Erstellenart': erstellenart.get()
+        }
+        root.quit()
+        root.destroy()
+        return data
+
+    result_holder = {'data': None}
+
+    def next_click():
+        if idx['i'] < len(pages) - 1:
+            idx['i'] += 1
+            pages[idx['i']].lift()
+            if idx['i'] == len(pages) - 1:
+                next_button.config(text='Fertig')
+        else:
+            result_holder['data'] = sammeln_und_schliessen()
+
+    def prev_click():
+        if idx['i'] > 0:
+            idx['i'] -= 1
+            pages[idx['i']].lift()
+            next_button.config(text='Weiter')
+
+    btn_frame = ttk.Frame(root)
+    btn_frame.pack(side="bottom", anchor="e", pady=6, padx=6)
+    back_button = ttk.Button(btn_frame, text="Zurück", command=prev_click)
+    back_button.pack(side="left", padx=(0,6))
+    next_button = ttk.Button(btn_frame, text="Weiter", command=next_click)
+    next_button.pack(side="left")
+
+    root.mainloop()
+    return result_holder['data']
+
+# === Benutzerinput & Excel-Ausgabe ===
+def get_user_input():
+    root = tk.Tk()
+    root.withdraw()
+    xml_dir = filedialog.askdirectory(title="XML-Verzeichnis auswählen")
+    if not xml_dir:
+        return None, None
+    excel_file = filedialog.asksaveasfilename(
+        title="Excel-Datei speichern unter", defaultextension=".xlsx",
+        filetypes=[("Excel-Dateien", "*.xlsx"), ("CSV-Dateien", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")]
+    )
+    root.destroy()
+    return xml_dir, excel_file
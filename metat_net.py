@@ -0,0 +1,522 @@
+# Netzwerk-Schicht von metat: URL-Cache, Erreichbarkeit, Verzeichnislisten und CSW-Harvesting.
+# requests wird nur geladen, wenn dieses Modul gebraucht wird.
+import os
+import io
+import json
+import time
+import threading
+import sqlite3
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Optional
+from lxml import etree
+import requests
+
+from metat_core import METRICS, namespaces, bounded_map, record_bytes
+
+# === Persistenter URL-Cache (SQLite) ===
+DEFAULT_CACHE_DIR = os.environ.get('METAT_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'metat')
+
+@dataclass
+class CacheEntry:
+    data: object
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool  # jünger als die TTL; sonst nur nach Revalidierung verwenden
+
+class UrlCache:
+    # Ergebnisse je (Art, URL): Erreichbarkeit und Verzeichnislisten samt ETag/Last-Modified.
+    # Einträge älter als ttl werden per Conditional Request revalidiert, bei mehr als
+    # max_entries Einträgen fliegen die am längsten nicht benutzten raus.
+    def __init__(self, cache_dir=None, ttl=7 * 24 * 3600, max_entries=100000):
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'urlcache.sqlite3')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' kind TEXT NOT NULL, url TEXT NOT NULL, data TEXT, etag TEXT, last_modified TEXT,'
+            ' stored_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (kind, url))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+        self._conn.commit()
+        # Anzahl Einträge einmal zählen und danach mitführen; COUNT(*) liest die ganze Tabelle
+        self._count = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def get(self, kind, url):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, etag, last_modified, stored_at FROM entries WHERE kind = ? AND url = ?',
+                (kind, url)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE kind = ? AND url = ?', (now, kind, url))
+            self._conn.commit()
+        data, etag, last_modified, stored_at = row
+        return CacheEntry(json.loads(data), etag, last_modified, now - stored_at < self.ttl)
+
+    def put(self, kind, url, data, etag=None, last_modified=None):
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                'SELECT 1 FROM entries WHERE kind = ? AND url = ?', (kind, url)
+            ).fetchone() is not None
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (kind, url, json.dumps(data), etag, last_modified, now, now)
+            )
+            self._count += not exists
+            if self._count > self.max_entries:
+                deleted = self._conn.execute(
+                    'DELETE FROM entries WHERE rowid IN '
+                    '(SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?)',
+                    (self._count - self.max_entries,)
+                ).rowcount
+                self._count -= deleted
+            self._conn.commit()
+
+    def touch(self, kind, url):
+        # nach erfolgreicher Revalidierung (304) gilt der Eintrag wieder als frisch
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE entries SET stored_at = ?, accessed_at = ? WHERE kind = ? AND url = ?',
+                (now, now, kind, url)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def conditional_headers(entry):
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+    return headers
+
+# === URL-Prüfung ===
+URL_HEADERS = {
+    'User-Agent': 'Mozilla/5.0'
+}
+
+# Statuscodes, bei denen ein erneuter Versuch sinnvoll ist
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+@dataclass
+class UrlStatus:
+    url: str
+    reachable: bool
+    status: Optional[int] = None
+    latency: Optional[float] = None  # Sekunden bis zur letzten Antwort
+    error: Optional[str] = None
+    from_cache: bool = False
+    content_type: Optional[str] = None
+    content_length: Optional[int] = None  # Größe der Ressource laut Server, ohne sie zu laden
+    final_url: Optional[str] = None  # nach Weiterleitungen
+
+def content_length(response):
+    # bei 206 steht die Gesamtgröße in Content-Range ("bytes 0-0/12345")
+    if response.status_code == 206:
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+def media_type(content_type):
+    # "application/zip; charset=..." -> "application/zip"
+    return content_type.split(';')[0].strip().lower() if content_type else None
+
+def make_session(pool_size=10):
+    # Keep-Alive-Session mit Connection-Pool, von mehreren Threads gemeinsam genutzt
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(URL_HEADERS)
+    return session
+
+class ReachabilityChecker:
+    # Prüft viele URLs nebenläufig: begrenzt gesamt (max_workers) und je Host (per_host),
+    # wiederholt Verbindungsfehler und 429/5xx mit exponentiellem Backoff
+    # memoize: jede URL höchstens einmal pro Checker prüfen, auch wenn mehrere Datensätze sie nennen
+    def __init__(self, max_workers=16, per_host=4, retries=2, backoff=0.5, timeout=5, session=None, cache=None,
+                 memoize=True):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or make_session(max_workers)
+        self.cache = cache
+        self.memoize = memoize
+        self._host_limits = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _probe(self, url, headers=None):
+        # HEAD; lehnt der Server das ab, ein GET auf das erste Byte. Der Body wird nie gelesen,
+        # die Verbindung wird direkt nach den Headern geschlossen.
+        response = self.session.head(url, headers=headers, allow_redirects=True, timeout=self.timeout)
+        response.close()
+        if response.status_code >= 400:
+            response = self._ranged_get(url, dict(headers or {}, Range='bytes=0-0'))
+            if response.status_code == 416:  # leere Ressource o. ä.: ohne Range erneut
+                response = self._ranged_get(url, headers)
+        return response
+
+    def _ranged_get(self, url, headers):
+        response = self.session.get(url, headers=headers, allow_redirects=True, timeout=self.timeout, stream=True)
+        response.close()
+        return response
+
+    def check(self, url):
+        if not url:
+            return UrlStatus(url, False)
+        if not self.memoize:
+            return self._check(url)
+        with self._lock:
+            future = self._results.get(url)
+            owner = future is None
+            if owner:
+                future = self._results[url] = Future()
+        if owner:
+            try:
+                future.set_result(self._check(url))
+            except Exception as e:
+                future.set_exception(e)
+                raise
+        return future.result()
+
+    def _check(self, url):
+        cached = self.cache.get('reachability', url) if self.cache else None
+        if cached and cached.fresh:
+            return UrlStatus(**dict(cached.data, from_cache=True))
+        result = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            start = time.perf_counter()
+            try:
+                with self._host_limit(url), METRICS.timer('url_check'):
+                    start = time.perf_counter()
+                    response = self._probe(url, conditional_headers(cached))
+            except Exception as e:
+                result = UrlStatus(url, False, latency=time.perf_counter() - start, error=str(e))
+                METRICS.observe_http(url, result.latency)
+                continue
+            latency = time.perf_counter() - start
+            METRICS.observe_http(url, latency)
+            if cached and response.status_code == 304:
+                self.cache.touch('reachability', url)
+                return UrlStatus(**dict(cached.data, latency=latency, from_cache=True))
+            result = UrlStatus(url, response.status_code < 400, response.status_code, latency,
+                               content_type=response.headers.get('Content-Type'),
+                               content_length=content_length(response),
+                               final_url=response.url)
+            if response.status_code not in RETRY_STATUS:
+                if self.cache:
+                    self.cache.put('reachability', url, asdict(result),
+                                   response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                break
+        return result
+
+    def check_all(self, urls):
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            return dict(zip(urls, pool.map(self.check, urls)))
+
+def check_urls_reachable(urls, **options):
+    # URL -> UrlStatus für alle übergebenen URLs
+    return ReachabilityChecker(**options).check_all(urls)
+
+_default_checker = None
+
+def probe_url(url):
+    global _default_checker
+    if _default_checker is None:
+        _default_checker = ReachabilityChecker(retries=0, memoize=False)
+    return _default_checker.check(url)
+
+def check_url_reachable(url):
+    if not url:
+        return False
+    return probe_url(url).reachable
+
+# === Scrape opengeodata.nrw.de for download files ===
+LISTING_HEADERS = {
+    'Accept': 'application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+}
+
+class ListingTooLarge(Exception):
+    pass
+
+def _local_name(tag):
+    return etree.QName(tag).localname if isinstance(tag, str) else None
+
+def parse_listing(chunks, max_bytes=None, deadline=None):
+    # Liest den Index inkrementell mit lxml und liefert die Dateinamen der zweiten <files>-Liste
+    # (wie bisher find_all('files')[1]) bzw. der einzigen, falls es nur eine gibt.
+    # Nach der zweiten Liste wird nicht weitergelesen.
+    parser = etree.XMLPullParser(events=('start', 'end'))
+    lists = []
+    current = None
+    received = 0
+
+    def handle_events():
+        nonlocal current
+        for event, el in parser.read_events():
+            name = _local_name(el.tag)
+            if event == 'start' and name == 'files' and current is None:
+                current = el
+                lists.append([])
+            elif event == 'end' and el is current:
+                current = None
+                el.clear()
+            elif event == 'end' and current is not None and el.getparent() is current:
+                if el.get('name'):
+                    lists[-1].append(el.get('name'))
+                el.clear()
+
+    for chunk in chunks:
+        received += len(chunk)
+        if max_bytes and received > max_bytes:
+            raise ListingTooLarge(f"Index größer als {max_bytes} Bytes")
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError("Index nicht rechtzeitig vollständig geladen")
+        parser.feed(chunk)
+        handle_events()
+        if len(lists) >= 2 and current is None:
+            break
+    else:
+        parser.close()
+        handle_events()
+    if not lists:
+        return None
+    return lists[1] if len(lists) > 1 else lists[0]
+
+class ListingResolver:
+    # Löst Zugriffs-URLs in (Dateinamen, Download-URLs) auf: gemeinsame Keep-Alive-Session,
+    # harte Zeit- und Größenlimits, jede URL höchstens einmal pro Lauf (auch bei parallelen Aufrufen)
+    def __init__(self, session=None, cache=None, timeout=(5, 30), total_timeout=120, max_bytes=50 * 1024 * 1024):
+        self.session = session or make_session()
+        self.cache = cache
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url):
+        # (Dateinamen, absolute URLs) oder None, wenn der Index nicht geladen werden konnte
+        if not url:
+            return None
+        with self._lock:
+            future = self._results.get(url)
+            owner = future is None
+            if owner:
+                future = self._results[url] = Future()
+        if owner:
+            try:
+                names = self._fetch_names(url)
+            except (requests.RequestException, ListingTooLarge, TimeoutError, etree.XMLSyntaxError) as e:
+                print(f"[WARN] Index {url} nicht lesbar: {e}")
+                names = None
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            future.set_result(None if names is None else (names, [urllib.parse.urljoin(url, n) for n in names]))
+        return future.result()
+
+    def _fetch_names(self, url):
+        cached = self.cache.get('listing', url) if self.cache else None
+        if cached and cached.fresh:
+            return cached.data
+        headers = dict(LISTING_HEADERS, **conditional_headers(cached))
+        start = time.perf_counter()
+        with METRICS.timer('listing'), \
+                self.session.get(url, headers=headers, allow_redirects=True, timeout=self.timeout, stream=True) as web:
+            METRICS.observe_http(url, time.perf_counter() - start)
+            if cached and web.status_code == 304:
+                self.cache.touch('listing', url)
+                return cached.data
+            if web.status_code != 200:
+                return None
+            names = parse_listing(web.iter_content(64 * 1024), self.max_bytes,
+                                  time.monotonic() + self.total_timeout)
+            if names is not None and self.cache:
+                self.cache.put('listing', url, names, web.headers.get('ETag'), web.headers.get('Last-Modified'))
+        return names
+
+def get_url_extensions(url, cache=None):
+    listing = ListingResolver(cache=cache).resolve(url)
+    return listing[0] if listing else None
+
+# === Return download files as urls
+
+def get_download_urls(url, files):
+    if not files or files[0] == 'Zugriffs-URL nicht erreichbar':
+        return None
+    download_urls = []
+    for file in files:
+        download_urls.append(urllib.parse.urljoin(url,file))
+
+    return download_urls
+
+# === Download-URLs auflösen (Netzwerk-Teil) ===
+def resolve_downloads(summary, reachability=None, cache=None, listings=None):
+    # summary: Ergebnis von analyze_record
+    # reachability: optionale URL -> UrlStatus-Tabelle aus check_urls_reachable
+    # cache: optionaler UrlCache für Verzeichnislisten
+    # listings: optionaler ListingResolver, der für den ganzen Lauf geteilt wird
+    download_url = summary['download_url']
+    access_url = summary['access_url']
+    download_files = []
+    download_urls = []
+    content_type = None
+    download_note = None
+
+    # === Prüfe Download-URL erreichbar
+    if not download_url:
+        listing = (listings or ListingResolver(cache=cache)).resolve(access_url) if access_url else None
+        if listing:
+            download_files, download_urls = listing
+            download_url = '; '.join(download_urls)
+        else:
+            # Hinweis nur für die sichtbare Spalte; für die FAIR-Regeln gibt es keine Download-URL
+            download_url = None
+            if access_url:
+                download_note = "Bitte manuell angeben, Zugriffs-URL nicht erreichbar"
+            else:
+                download_note = "Bitte manuell angeben, keine Download- oder Zugriffs-URL im Datensatz"
+            METRICS.count('Download-URL: manuell angeben')
+    else:
+        status = reachability.get(download_url) if reachability else None
+        status = status or probe_url(download_url)
+        content_type = media_type(status.content_type)
+        if not status.reachable:
+            download_url += " (Bitte manuell angeben, URL nicht erreichbar)"
+            METRICS.count('Download-URL: manuell angeben')
+
+    # Zugriffs-URL lassen wir unangetastet, auch wenn sie evtl. nicht erreichbar ist
+    return {
+        'download_url': download_url,
+        'download_files': download_files,
+        'download_urls': download_urls,
+        'content_type': content_type,  # tatsächlicher Medientyp der Download-URL laut Server
+        'download_note': download_note  # Hinweis für die Spalte Download-URL, falls keine gefunden
+    }
+
+# === Vorab-Auflösung der URLs, während der Dialog offen ist ===
+def _resolve_item(item, checker, listings):
+    path, summary, error = item
+    if summary is None:
+        return path, summary, error, None
+    # nur die Download-URL wird geprüft (die Zugriffs-URL bleibt ungeprüft), direkt im Prefetch-Thread
+    download_url = summary['download_url']
+    reachability = {download_url: checker.check(download_url)} if download_url else None
+    return path, summary, error, resolve_downloads(summary, reachability, listings=listings)
+
+def prefetch_resolved(analyzed, checker, listings, depth=8):
+    # Hintergrund-Threads prüfen/scrapen die URLs der nächsten depth Datensätze;
+    # liefert (Pfad, summary, Fehler, resolved) in Eingabereihenfolge
+    with ThreadPoolExecutor(max_workers=depth) as pool:
+        yield from bounded_map(pool, lambda item: _resolve_item(item, checker, listings), analyzed, depth)
+
+# === CSW-2.0.2-Harvesting direkt in die Pipeline ===
+CSW_NS = 'http://www.opengis.net/cat/csw/2.0.2'
+
+class CswSource:
+    # Blättert per GetRecords (outputSchema gmd) durch einen Katalog, lädt parallel_pages Seiten
+    # gleichzeitig und liefert jeden gmd:MD_Metadata als (ID, XML-Bytes), ohne Zwischendateien.
+    # Die Position des nächsten offenen Datensatzes (nextRecord) steht in cursor_file; nach einem
+    # Abbruch setzt der nächste Lauf dort fort, nach vollständigem Durchlauf wird sie gelöscht.
+    def __init__(self, url, page_size=50, parallel_pages=4, cursor_file=None, session=None, timeout=(10, 120)):
+        self.url = url
+        self.page_size = page_size
+        self.parallel_pages = max(parallel_pages, 1)
+        self.cursor_file = cursor_file
+        self.session = session or make_session(self.parallel_pages)
+        self.timeout = timeout
+
+    def _fetch_page(self, start):
+        params = {
+            'service': 'CSW',
+            'version': '2.0.2',
+            'request': 'GetRecords',
+            'typeNames': 'csw:Record',
+            'resultType': 'results',
+            'elementSetName': 'full',
+            'outputSchema': namespaces['gmd'],
+            'startPosition': start,
+            'maxRecords': self.page_size
+        }
+        t0 = time.perf_counter()
+        with METRICS.timer('csw'):
+            response = self.session.get(self.url, params=params, timeout=self.timeout)
+        METRICS.observe_http(self.url, time.perf_counter() - t0)
+        response.raise_for_status()
+        matched, next_record = None, 0
+        records = []
+        position = start
+        for event, el in etree.iterparse(io.BytesIO(response.content), events=('start', 'end')):
+            if event == 'start' and el.tag == f'{{{CSW_NS}}}SearchResults':
+                matched = int(el.get('numberOfRecordsMatched', 0))
+                next_record = int(el.get('nextRecord', 0))
+            elif event == 'end' and el.tag == f'{{{namespaces["gmd"]}}}MD_Metadata':
+                records.append((f'{self.url}#{position}', record_bytes(el)))
+                position += 1
+                el.clear()
+        if matched is None:
+            raise ValueError(f"Keine csw:SearchResults in der Antwort von {self.url}")
+        return records, matched, next_record
+
+    def load_cursor(self):
+        if not self.cursor_file or not os.path.exists(self.cursor_file):
+            return 1
+        with open(self.cursor_file, encoding='utf-8') as f:
+            cursor = json.load(f)
+        return cursor['next_record'] if cursor.get('url') == self.url else 1
+
+    def record_done(self, record_id):
+        # nach dem Schreiben eines Datensatzes aufrufen; Datensätze werden in Reihenfolge abgeschlossen
+        if self.cursor_file:
+            tmp = self.cursor_file + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'url': self.url, 'next_record': int(record_id.rpartition('#')[2]) + 1}, f)
+            os.replace(tmp, self.cursor_file)
+
+    def finish(self):
+        if self.cursor_file and os.path.exists(self.cursor_file):
+            os.remove(self.cursor_file)
+
+    def __iter__(self):
+        start = self.load_cursor()
+        records, matched, next_record = self._fetch_page(start)
+        yield from records
+        if not next_record or not records:
+            return
+        # manche Server kappen maxRecords; die tatsächliche Seitengröße bestimmt die weiteren Starts
+        step = len(records)
+        starts = range(next_record, matched + 1, step)
+        with ThreadPoolExecutor(max_workers=self.parallel_pages) as pool:
+            for records, _, _ in bounded_map(pool, self._fetch_page, starts, self.parallel_pages):
+                yield from records
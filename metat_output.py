@@ -0,0 +1,192 @@
+# Ausgabe-Sinks von metat; openpyxl bzw. pyarrow werden erst für .xlsx bzw. .parquet geladen.
+import os
+import csv
+import json
+
+from metat_core import YES_NO_FIELDS
+
+# === Ausgabe: Zeilen werden sofort geschrieben statt gesammelt ===
+# Spaltenreihenfolge der Excel-Ausgabe
+OUTPUT_COLUMNS = [
+    'Übernommen von Appsmith', 'Metadatensatz_ID', 'Datensatz_ID', 'Titel', 'Beschreibung', 'Kategorie',
+    'enthält synthetische Daten', 'ist zugänglich ohne Zahlung', 'ist zugänglich ohne Registrierung',
+    'Erstellenart', 'Geographische Beschreibung', 'Lizenz', 'Herausgeber', 'Kontakt E-Mail',
+    'Download-URL', 'Zugriffs-URL', 'Metadatenstandard', 'Metadatenstandardversion',
+    'Veröffentlichungsdatum', 'Letzte Aktualisierung', 'Erstellungsdatum des Metadatensatzes', 'Format',
+    'RDA-F1-01M', 'RDA-F1-01D', 'RDA-F1-02M', 'RDA-F1-02D', 'RDA-F2-01M', 'RDA-F3-01M',
+    'RDA-A1-01M', 'RDA-A1-02M', 'RDA-A1-02D', 'RDA-A1-04M', 'RDA-A1-04D', 'RDA-A1.1-01M', 'RDA-A1.1-01D',
+    'RDA-I1-01M', 'RDA-I1-02M', 'RDA-I2-01M', 'RDA-R1.1-01M', 'RDA-R1.3-01M', 'RDA-R1.3-01D', 'RDA-R1.3-02M',
+    'Eintragsdatum', 'Keywords', 'Kommentar', 'Person'
+]
+
+class RowSink:
+    # Basisklasse: write() je Zeile, close() am Ende; Spalten immer in OUTPUT_COLUMNS-Reihenfolge
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = list(columns or OUTPUT_COLUMNS)
+        self.count = 0
+
+    def write(self, row):
+        self._write([row.get(c) for c in self.columns])
+        self.count += 1
+
+    def write_frame(self, frame):
+        # ganzer Block aus evaluate_fair; fehlende Werte werden wie bei write() zu None
+        frame = frame.reindex(columns=self.columns).astype(object)
+        for values in frame.where(frame.notna(), None).itertuples(index=False, name=None):
+            self._write(list(values))
+        self.count += len(frame)
+
+    def _write(self, values):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ExcelSink(RowSink):
+    # openpyxl im write-only-Modus: Zeilen landen sofort in einer temporären Datei,
+    # die Arbeitsmappe wird erst beim close() zusammengesetzt
+    def __init__(self, path, columns=None):
+        from openpyxl import Workbook
+        super().__init__(path, columns)
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet('Sheet1')  # wie bisher DataFrame.to_excel
+        self._ws.append(self.columns)
+
+    def _write(self, values):
+        self._ws.append(values)
+
+    def close(self):
+        self._wb.save(self.path)
+
+class CsvSink(RowSink):
+    # append-only; jede Zeile ist nach write() auf der Platte
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+        self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write(self, values):
+        self._writer.writerow(values)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class JsonlSink(RowSink):
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, values):
+        self._file.write(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# Spaltentypen für spaltenorientierte Ausgabe (Parquet); alle übrigen Spalten sind Strings
+BOOLEAN_COLUMNS = [c for c in OUTPUT_COLUMNS if c.startswith('RDA-')] + YES_NO_FIELDS
+# aus gco:Date bzw. Tagesdatum -> date32; aus gco:DateTime -> timestamp (Angaben mit Zeitzone nach UTC)
+DATE_COLUMNS = ['Letzte Aktualisierung', 'Erstellungsdatum des Metadatensatzes', 'Eintragsdatum']
+TIMESTAMP_COLUMNS = ['Veröffentlichungsdatum']
+# wenige verschiedene Werte über viele Datensätze -> Dictionary-Kodierung
+DICTIONARY_COLUMNS = [
+    'Übernommen von Appsmith', 'Kategorie', 'Erstellenart', 'Geographische Beschreibung', 'Lizenz', 'Herausgeber',
+    'Metadatenstandard', 'Metadatenstandardversion', 'Format', 'Keywords', 'Kommentar', 'Person'
+]
+
+class ParquetSink(RowSink):
+    # pyarrow/Parquet: 'ja'/'nein' als bool, Datumsfelder als date32 (Datumsteil, sonst null),
+    # Zeitpunkte als timestamp (ISO 8601, sonst null), Dictionary-Kodierung für DICTIONARY_COLUMNS.
+    # Blöcke werden gepuffert und ab row_group_rows Zeilen als eigene Row Group geschrieben;
+    # der Speicher bleibt dadurch begrenzt.
+    row_group_rows = 50000
+
+    def __init__(self, path, columns=None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        super().__init__(path, columns)
+        self._pa = pa
+        types = {c: pa.bool_() for c in BOOLEAN_COLUMNS}
+        types.update({c: pa.date32() for c in DATE_COLUMNS})
+        types.update({c: pa.timestamp('ms') for c in TIMESTAMP_COLUMNS})
+        types.update({c: pa.dictionary(pa.int32(), pa.string()) for c in DICTIONARY_COLUMNS})
+        self._schema = pa.schema([(c, types.get(c, pa.string())) for c in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows = []
+        self._tables = []
+        self._pending = 0
+
+    def _column(self, name, values):
+        import pandas as pd
+        pa = self._pa
+        field = self._schema.field(name)
+        if pa.types.is_boolean(field.type):
+            return pa.array(values.map({'ja': True, 'nein': False}), type=pa.bool_(), from_pandas=True)
+        if pa.types.is_date32(field.type):
+            dates = pd.to_datetime(values.astype('string').str[:10], format='%Y-%m-%d', errors='coerce')
+            return pa.array(dates.dt.date, type=pa.date32(), from_pandas=True)
+        if pa.types.is_timestamp(field.type):
+            times = pd.to_datetime(values.astype('string'), format='ISO8601', errors='coerce', utc=True)
+            return pa.array(times.dt.tz_localize(None), type=field.type, from_pandas=True, safe=False)
+        strings = pa.array(values.astype(object).where(values.notna(), None), type=pa.string(), from_pandas=True)
+        return strings.dictionary_encode() if pa.types.is_dictionary(field.type) else strings
+
+    def write_frame(self, frame):
+        self._convert_rows()  # Reihenfolge mit vorher per write() geschriebenen Zeilen wahren
+        self._append(frame)
+        self.count += len(frame)
+
+    def _append(self, frame):
+        frame = frame.reindex(columns=self.columns)
+        self._tables.append(self._pa.Table.from_arrays(
+            [self._column(c, frame[c]) for c in self.columns], schema=self._schema))
+        self._pending += len(frame)
+        if self._pending >= self.row_group_rows:
+            self._flush()
+
+    def _write(self, values):
+        # Einzelzeilen aus write() sammeln und blockweise umwandeln
+        self._rows.append(values)
+        if len(self._rows) >= FAIR_BATCH_ROWS:
+            self._convert_rows()
+
+    def _convert_rows(self):
+        import pandas as pd
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self._append(pd.DataFrame(rows, columns=self.columns))
+
+    def _flush(self):
+        if self._tables:
+            self._writer.write_table(self._pa.concat_tables(self._tables), row_group_size=self._pending)
+            self._tables, self._pending = [], 0
+
+    def close(self):
+        self._convert_rows()
+        self._flush()
+        self._writer.close()
+
+# Zeilen je DataFrame-Block für evaluate_fair
+FAIR_BATCH_ROWS = 2000
+
+SINKS = {
+    '.xlsx': ExcelSink,
+    '.csv': CsvSink,
+    '.jsonl': JsonlSink,
+    '.parquet': ParquetSink
+}
+
+def open_sink(path, columns=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise ValueError(f"Unbekanntes Ausgabeformat: {ext} (möglich: {', '.join(SINKS)})")
+    return SINKS[ext](path, columns)